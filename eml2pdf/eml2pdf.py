@@ -1,5 +1,6 @@
 import argparse
 import logging
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -44,6 +45,14 @@ def get_args() -> argparse.Namespace:
         'elements such as remote images, scripts, etc. This '
         'may expose sensitive user information.',
     )
+    parent_parser.add_argument(
+        '--no-presentational-hints',
+        dest='presentational_hints',
+        action='store_false',
+        help='Ignore HTML presentational attributes such as bgcolor and '
+        'width. Renders faster, but layouts that rely on them may look '
+        'different.',
+    )
     parent_parser.add_argument(
         '-d',
         '--debug_html',
@@ -107,6 +116,20 @@ def get_args() -> argparse.Namespace:
     return args
 
 
+def _use_forkserver():
+    """Start pool workers from a fork server where the platform has one.
+
+    The fork server imports eml2pdf.libeml2pdf, and with it WeasyPrint, once.
+    Workers forked from it start without that import cost (spawn, the macOS
+    default, re-imports everything per worker) and without inheriting the
+    state of the CLI process. This is process-wide state that needs a
+    guarded __main__, so it is set by the CLI and not by the library.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method('forkserver', force=True)
+        multiprocessing.set_forkserver_preload(['eml2pdf.libeml2pdf'])
+
+
 def main():
     # Set up argument parser
     args = get_args()
@@ -137,8 +160,10 @@ def main():
             args.page,
             args.debug_html,
             args.unsafe,
+            presentational_hints=args.presentational_hints,
         )
     elif 'input_dir' in args:
+        _use_forkserver()
         libeml2pdf.process_all_emls_in_dir(
             args.input_dir,
             args.output_dir,
@@ -146,6 +171,7 @@ def main():
             args.debug_html,
             args.page,
             args.unsafe,
+            args.presentational_hints,
         )
     else:
         raise ValueError(f'Could not process arguments: {sys.argv}')
@@ -1,23 +1,25 @@
-import base64
+import binascii
 import datetime
 import email
 import email.header
 import email.message
+import email.parser
+import email.policy
 import email.utils
-import fnmatch
+import functools
 import hashlib
 import logging
 import os
 import re
 import sys
+from collections.abc import Callable
 from dataclasses import dataclass
 from html import escape
 from io import BufferedWriter
 from multiprocessing import Pool
 from pathlib import Path
-from typing import overload
+from typing import Any, overload
 
-from hurry.filesize import size  # type: ignore
 from markdown import markdown
 from weasyprint import CSS, HTML
 
@@ -25,6 +27,38 @@ from . import security
 
 logger = logging.getLogger(__name__)
 
+# Translation table for PDF filenames: drop characters that are illegal in
+# filenames and replace spaces with underscores, in a single pass.
+_FILENAME_TRANS = str.maketrans({**dict.fromkeys('<>:"/\\|?*'), ' ': '_'})
+
+# Constant head of every generated HTML document. Declares UTF-8 so
+# WeasyPrint doesn't have to guess the encoding.
+_HTML_PREAMBLE = """
+<meta charset="UTF-8">
+<meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
+"""
+
+# Shared parser for all EML input. The parsing code is written against the
+# compat32 policy, so pin it instead of relying on the default.
+_PARSER = email.parser.BytesParser(policy=email.policy.compat32)
+
+# A cid: URL, up to the end of the attribute value or CSS url(). '&' ends it
+# too, for entity-quoted URLs like url(&quot;cid:...&quot;) in style values.
+_CID_RE = re.compile(r'cid:([^"\'\s>)&]+)')
+
+# Literal \uXXXX or \UXXXXXXXX escapes left in decoded text parts.
+_UNICODE_ESCAPE_RE = re.compile(r'\\u[0-9a-fA-F]{4}|\\U[0-9a-fA-F]{8}')
+
+# Binary size units for the attachment list, largest first.
+_SIZE_UNITS = (
+    (1024**5, 'P'),
+    (1024**4, 'T'),
+    (1024**3, 'G'),
+    (1024**2, 'M'),
+    (1024, 'K'),
+    (1, 'B'),
+)
+
 
 @dataclass
 class _Attachment:
@@ -129,12 +163,14 @@ class _Header:
 
         msg_date = msg.get('date', '')
         self.date = (
-            email.utils.parsedate_to_datetime(msg.get('date', ''))
-            if msg_date
-            else None
+            email.utils.parsedate_to_datetime(msg_date) if msg_date else None
         )
+        # Slicing isoformat() is much cheaper than strftime() and gives the
+        # same 'YYYY-MM-DD, HH:MM' result.
         self.formatted_date = (
-            self.date.strftime('%Y-%m-%d, %H:%M') if self.date else 'No date'
+            self.date.isoformat()[:16].replace('T', ', ')
+            if self.date
+            else 'No date'
         )
 
         self.html = f"""
@@ -158,10 +194,12 @@ def _embed_imgs(html_content: str, attachments: dict) -> str:
     references.
 
     Processing:
-        1. For each CID attachment collected during message walking
-        2. Base64-encode the image bytes
-        3. Create a data URI: data:{content_type};base64,{encoded_data}
-        4. Replace all cid:{cid} references in HTML with the data URI
+        1. Find all cid:{cid} references in the HTML in a single regex pass
+        2. Look up the CID among the attachments collected during message
+            walking. Unknown CIDs are left as they are.
+        3. Base64-encode the image bytes, once per CID
+        4. Replace the reference with a data URI:
+            data:{content_type};base64,{encoded_data}
 
     Args:
         html_content (str): HTML content potentially containing cid: image
@@ -177,15 +215,28 @@ def _embed_imgs(html_content: str, attachments: dict) -> str:
         Before: <img src="cid:image001@example.com">
         After:  <img src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUg...">
     """
-    if html_content:
-        for cid, attachment in attachments.items():
-            content_type = attachment['content_type']
-            content = base64.b64encode(attachment['content']).decode('utf-8')
-            data_uri = f'data:{content_type};base64,{content}'
+    if not html_content or not attachments:
+        return html_content
+
+    # Images are encoded on their first reference only, so attached images
+    # that the HTML never shows aren't encoded at all.
+    data_uris: dict[str, str] = {}
+
+    def _data_uri(match: re.Match[str]) -> str:
+        cid = match.group(1)
+        if cid not in data_uris:
+            if cid not in attachments:
+                return match.group(0)
+            attachment = attachments[cid]
+            content = binascii.b2a_base64(
+                attachment['content'], newline=False
+            ).decode('ascii')
+            data_uris[cid] = (
+                f'data:{attachment["content_type"]};base64,{content}'
+            )
+        return data_uris[cid]
 
-            # Replace CID references in HTML
-            html_content = html_content.replace(f'cid:{cid}', data_uri)
-    return html_content
+    return _CID_RE.sub(_data_uri, html_content)
 
 
 def _decode_to_str(
@@ -207,7 +258,8 @@ def _decode_to_str(
     Error Handling:
         - UnicodeDecodeError: Byte sequence invalid for specified charset
             → fallback
-        - LookupError: Charset name unknown or not supported → fallback
+        - LookupError: Charset name unknown or not supported → UTF-8 with
+            'replace' mode
         - Exception during escape decoding: Keep the 'replace' version
 
     Args:
@@ -261,18 +313,25 @@ def _decode_to_str(
         try:
             # Attempt strict decoding
             decoded = bytes_content.decode(content_charset)
-        except (UnicodeDecodeError, LookupError):
+        except UnicodeDecodeError:
             # Fallback for binary data/mismatched charsets
             logger.warning(
                 f'Strict decode failed for {content_charset}. Using '
                 "'replace' mode."
             )
             decoded = bytes_content.decode(content_charset, errors='replace')
+        except LookupError:
+            # Python doesn't know the declared charset at all
+            logger.warning(
+                f'Unknown charset {content_charset}. Decoding as UTF-8 in '
+                "'replace' mode."
+            )
+            decoded = bytes_content.decode('utf-8', errors='replace')
 
-        # Handle unicode escape patterns (e.g., \u00a0)
-        unicode_escape_pattern = r'\\u[0-9a-fA-F]{4}|\\U[0-9a-fA-F]{8}'
+        # Handle unicode escape patterns (e.g., \u00a0). The backslash test
+        # is a cheap scan that spares clean text the regex search.
         try:
-            if re.search(unicode_escape_pattern, decoded):
+            if '\\' in decoded and _UNICODE_ESCAPE_RE.search(decoded):
                 decoded = decoded.encode('utf-8').decode('unicode-escape')
                 logger.debug(f'unicode escaped decoded : {decoded[:100]}...')
         except Exception as e:
@@ -337,10 +396,11 @@ def _create_attachment(
     if not filename:
         return None
     filename = header_to_html(filename)
-    filesize = sys.getsizeof(payload)
-    _hash = hashlib.md5()
-    _hash.update(payload)
-    return _Attachment(name=filename, size=filesize, md5sum=_hash.hexdigest())
+    filesize = len(payload)
+    # MD5 is kept because users verify saved attachments with md5sum. It is
+    # a fingerprint here, not a security measure.
+    md5sum = hashlib.md5(payload, usedforsecurity=False).hexdigest()
+    return _Attachment(name=filename, size=filesize, md5sum=md5sum)
 
 
 def _walk_eml(
@@ -361,8 +421,8 @@ def _walk_eml(
         **Text Content (plain/html)**:
             - Conditions: content_type is text/plain or text/html AND
               (content_disposition is None OR 'inline')
-            - Processing: Decode using _decode_to_str() and append to content
-                strings
+            - Processing: Decode using _decode_to_str() and collect per
+                content type, joined once after the walk
             - Note: Multiple text parts are concatenated (handles
                 multipart/alternative)
 
@@ -397,16 +457,27 @@ def _walk_eml(
             of _Attachment objects with metadata.
 
     Note:
-        Skips parts with no payload or non-bytes payloads.
+        Skips multipart containers and parts that are neither text content
+        nor attachments without decoding their payload. Also skips parts
+        with no payload or non-bytes payloads.
     """
-    html_content = ''
-    plain_text_content = ''
+    html_parts: list[str] = []
+    plain_text_parts: list[str] = []
     cid_attachments = {}
     attachments: list[_Attachment] = list()
 
     for part in msg.walk():
+        # Containers have no payload of their own, their parts follow.
+        if part.is_multipart():
+            continue
+
         content_disposition = part.get_content_disposition()
         content_type = part.get_content_type()
+        is_text = _is_text_content(content_type, content_disposition)
+
+        # Only decode payloads we are going to use
+        if not is_text and content_disposition not in {'attachment', 'inline'}:
+            continue
         payload = part.get_payload(decode=True)
 
         # Skip invalid parts
@@ -414,42 +485,42 @@ def _walk_eml(
             continue
 
         # Handle text content
-        if _is_text_content(content_type, content_disposition):
+        if is_text:
             decoded_payload = _decode_to_str(
                 payload,
                 part.get_content_charset() or 'utf-8',
                 content_transfer_encoding=_get_cte(part),
             )
             if content_type == 'text/plain':
-                plain_text_content += decoded_payload
+                plain_text_parts.append(decoded_payload)
             else:
-                html_content += decoded_payload
+                html_parts.append(decoded_payload)
             continue
 
         # Handle attachments and inline files
-        if content_disposition in {'attachment', 'inline'}:
-            filename = part.get_filename()
-            is_image = content_type.startswith('image/')
-
-            # Save as attachment if appropriate
-            if _should_save_as_attachment(content_disposition, is_image) and (
-                attachment := _create_attachment(filename, payload)
-            ):
-                attachments.append(attachment)
-
-            # Handle inline images for rendering
-            if is_image and (cid := part.get('Content-ID')):
-                cid = cid.strip('<>')
-                cid_attachments[cid] = {
-                    'filename': filename,
-                    'content': payload,
-                    'content_type': content_type,
-                }
-
+        filename = part.get_filename()
+        is_image = content_type.startswith('image/')
+
+        # Save as attachment if appropriate
+        if _should_save_as_attachment(content_disposition, is_image) and (
+            attachment := _create_attachment(filename, payload)
+        ):
+            attachments.append(attachment)
+
+        # Handle inline images for rendering
+        if is_image and (cid := part.get('Content-ID')):
+            cid = cid.strip('<>')
+            cid_attachments[cid] = {
+                'filename': filename,
+                'content': payload,
+                'content_type': content_type,
+            }
+
+    html_content = ''.join(html_parts)
     html_content = (
         _embed_imgs(html_content, cid_attachments)
         if html_content
-        else markdown(plain_text_content)
+        else markdown(''.join(plain_text_parts))
     )
     return (html_content, attachments)
 
@@ -488,13 +559,11 @@ def _get_output_base_path(
         Path('/out/2024-01-15-Meeting_Notes.pdf')
     """
     # Format date for filename prefix
-    file_date = date.strftime('%Y-%m-%d') if date else 'nodate'
+    file_date = date.isoformat()[:10] if date else 'nodate'
 
     # Create sanitized subject for filename
-    safe_subject = re.sub(r'[<>:"/\\|?*]', '', subject)  # Remove illegal chars
-    safe_subject = safe_subject.replace(
-        ' ', '_'
-    )  # Replace spaces with underscores
+    # Remove illegal chars and replace spaces with underscores
+    safe_subject = subject.translate(_FILENAME_TRANS)
 
     # Create base output filename
     base_filename = f'{file_date}-{safe_subject}.pdf'
@@ -507,8 +576,8 @@ def _get_exclusive_outfile(outfile_path: Path) -> BufferedWriter:
     """Open output file exclusively with automatic conflict resolution.
 
     Attempts to open the file with exclusive creation ('xb' mode). If the file
-    already exists, automatically increments a counter suffix until an
-    available filename is found: filename_1.pdf, filename_2.pdf, etc.
+    already exists, the output directory is scanned once and the first
+    counter suffix not yet taken is used: filename_1.pdf, filename_2.pdf, etc.
 
     Multiprocessing Safety:
         Uses exclusive creation to prevent race conditions when multiple
@@ -522,6 +591,10 @@ def _get_exclusive_outfile(outfile_path: Path) -> BufferedWriter:
         BufferedWriter: Opened file object in binary write mode, ready for
             WeasyPrint's HTML.write_pdf() method.
 
+    Raises:
+        OSError: Any error other than an existing file, e.g. a missing
+            directory or insufficient permissions.
+
     Note:
         1. File is opened in binary mode ('xb') for compatibility with
             WeasyPrint. The exclusive flag ensures no existing file is
@@ -534,60 +607,71 @@ def _get_exclusive_outfile(outfile_path: Path) -> BufferedWriter:
         <_io.BufferedWriter name='report_1.pdf'>
     """
     try:
-        outfile = open(outfile_path, 'xb')  # noqa: SIM115
-    except OSError as e:
-        logger.debug(f'Could not open {outfile_path} exclusively. {e}')
-        outfile = open(os.devnull, 'wb')  # noqa: SIM115
-        outfile.close()  # We won't use devnull.
-
-    counter = 1
-    while outfile.name == os.devnull:
-        new_outfile_path = Path(outfile_path.parent) / Path(
-            f'{outfile_path.stem}_{counter}{outfile_path.suffix}'
-        )
+        return open(outfile_path, 'xb')  # noqa: SIM115
+    except FileExistsError:
+        logger.debug(f'{outfile_path} exists. Looking for a free name.')
+
+    # Scan the directory once instead of probing every candidate name on
+    # disk. Threads of mails with the same date and subject would otherwise
+    # cost one failed open() per existing sibling.
+    with os.scandir(outfile_path.parent) as entries:
+        taken = {entry.name for entry in entries}
+
+    counter = 0
+    while True:
+        counter += 1
+        new_name = f'{outfile_path.stem}_{counter}{outfile_path.suffix}'
+        if new_name in taken:
+            continue
+        new_outfile_path = outfile_path.parent / new_name
         try:
-            outfile = open(new_outfile_path, 'xb')  # noqa: SIM115
-        except OSError as e:
-            logger.debug(f'Could not open {outfile_path} exclusively. {e}')
-            counter += 1
-    return outfile
+            return open(new_outfile_path, 'xb')  # noqa: SIM115
+        except FileExistsError:
+            # Another process claimed the name since the scan.
+            logger.debug(f'{new_outfile_path} was taken. Trying the next.')
 
 
 def _get_filepaths(input_dir: Path) -> list[Path]:
     """Find all EML files in directory with case-insensitive matching.
 
-    Searches for files matching *.eml pattern (case-insensitive) in the input
-    directory. Handles Python version differences for glob() case sensitivity.
+    Lists the input directory once with os.scandir() and keeps the regular
+    files whose name ends in .eml, in any case. Subdirectories are not
+    searched.
 
     Args:
         input_dir (Path): Directory to search for EML files.
 
     Returns:
-        list[Path]: List of paths to EML files found.
+        list[Path]: List of paths to EML files found. Empty if input_dir
+            does not exist or is not a directory, like Path.glob().
+    """
+    try:
+        with os.scandir(input_dir) as entries:
+            return [
+                input_dir / entry.name
+                for entry in entries
+                if entry.name.lower().endswith('.eml') and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
 
-    Note:
-        Uses case_sensitive parameter for Python 3.12+, falls back to manual
-        filtering for earlier versions.
+
+def _fmt_size(num_bytes: int) -> str:
+    """Format a byte count as a short human-readable size.
+
+    Rounds down to whole binary units, like hurry.filesize's traditional
+    format which eml2pdf used before.
+
+    Args:
+        num_bytes (int): Size in bytes.
+
+    Returns:
+        str: Size such as '0B', '512B', '1K' or '3M'.
     """
-    # case_sensitive is added to pathlib.Path.glob() in 3.12
-    # Debian is at 3.11. We can remove this test when Debian reaches 3.12.
-    eml_pat = '*.eml'
-    if sys.version_info.minor >= 12:
-        # Nice new syntax. Unpack the Generator returned by glob() in a list.
-        # Mypy won't know this syntax. Ignore it for that line.
-        filepaths = list(
-            input_dir.glob(  # type: ignore
-                eml_pat, case_sensitive=None
-            )
-        )
-    else:
-        # Ugly old syntax
-        filepaths = [
-            path
-            for path in input_dir.glob('**/*')
-            if fnmatch.fnmatchcase(path.name.lower(), eml_pat)
-        ]
-    return filepaths
+    for factor, suffix in _SIZE_UNITS:
+        if num_bytes >= factor:
+            return f'{num_bytes // factor}{suffix}'
+    return f'{num_bytes}B'
 
 
 def _generate_attachment_list(attachments: list[_Attachment]) -> str:
@@ -608,28 +692,25 @@ def _generate_attachment_list(attachments: list[_Attachment]) -> str:
         document.pdf      1.2 MB   a1b2c3d4e5f6...
         spreadsheet.xls   256 kB   f6e5d4c3b2a1...
     """
-    html = ''
-    if attachments:
-        html += (
-            '<table style="font-family: serif; '
-            'margin-bottom: 20px;'
-            'border-spacing: 1rem 0;'
-            'text-align: left;">'
-        )
-        html += (
-            '<thead><tr><th colspan="3">Attachments:</th></tr>'
-            '<tr><th scope="col">Name</th>'
-            '<th scope="col">Size</th>'
-            '<th scope="col">MD5sum</th></tr></thead>'
-        )
-        for at in attachments:
-            html += (
-                f'<tr><td>{at.name}</td><td>{size(at.size)}</td>'
-                f'<td>{at.md5sum}</td></tr>'
-            )
-        html += '</table>'
+    if not attachments:
+        return ''
 
-    return html
+    rows = (
+        f'<tr><td>{at.name}</td><td>{_fmt_size(at.size)}</td>'
+        f'<td>{at.md5sum}</td></tr>'
+        for at in attachments
+    )
+    return (
+        '<table style="font-family: serif; '
+        'margin-bottom: 20px;'
+        'border-spacing: 1rem 0;'
+        'text-align: left;">'
+        '<thead><tr><th colspan="3">Attachments:</th></tr>'
+        '<tr><th scope="col">Name</th>'
+        '<th scope="col">Size</th>'
+        '<th scope="col">MD5sum</th></tr></thead>'
+        f'{"".join(rows)}</table>'
+    )
 
 
 def _get_cte(message: email.message.Message) -> str:
@@ -646,29 +727,33 @@ def _get_cte(message: email.message.Message) -> str:
 
 
 def _generate_html(
-    msg: email.message.Message, logging_id: str | None = None
+    msg: email.message.Message,
+    logging_id: str | None = None,
+    unsafe: bool = False,
 ) -> tuple[_Header, str]:
     """Generates HTML for a given message.
 
+    Only the email body is sanitized. The header table and attachment list
+    around it are built from escaped values by eml2pdf itself.
+
     Args:
         message: (email.message.Message): Email message to generate HTML for.
         logging_id (str | None): Optional identifier for logging context.
+        unsafe (bool): Skip sanitizing the email body. Defaults to False.
 
     Returns (str): The email as HTML
     """
-    email_header = _Header(msg, logging_id)
-    html_content, attachments = _walk_eml(msg, logging_id)
-    attachment_list = _generate_attachment_list(attachments)
-    # Add UTF-8 meta tag and email header if not present
-    if isinstance(html_content, str):
-        html_content = f"""
-<meta charset="UTF-8">
-<meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-{email_header.html}
-{attachment_list}
-<hr>
-{html_content}
-"""
+    parsed = _Email(msg, logging_id)
+    email_header = parsed.header
+    html_content = (
+        parsed.html if unsafe else security.sanitize_html(parsed.html)
+    )
+    attachment_list = _generate_attachment_list(parsed.attachments)
+    # Frame the body with the UTF-8 meta tags, header and attachment list
+    html_content = (
+        f'{_HTML_PREAMBLE}{email_header.html}\n{attachment_list}\n<hr>\n'
+        f'{html_content}\n'
+    )
     return email_header, html_content
 
 
@@ -679,18 +764,19 @@ def process_eml(
     debug_html: bool = False,
     unsafe: bool = False,
     logging_id: str | None = None,
+    presentational_hints: bool = True,
 ):
     """Process a single EML file and generate a PDF.
 
-    1. Parse EML file with email.message_from_binary_file() (fallback to
-        message_from_file())
+    1. Parse the EML file with a compat32 email.parser.BytesParser
     2. Extract header (from/to/subject/date)
     3. Walk message parts to extract content and attachments
     4. Generate attachment list table
     5. Assemble complete HTML with UTF-8 meta tags, header, attachments, and
        body
     6. Generate output filename from date and subject
-    7. Convert to PDF (with sanitization unless unsafe=True)
+    7. Convert to PDF. The email body is sanitized in step 5 unless
+       unsafe=True.
 
     HTML Structure:
         - UTF-8 meta tags
@@ -710,6 +796,8 @@ def process_eml(
         unsafe (bool, optional): Skip HTML sanitization. Defaults to False.
         logging_id (str | None, optional): Identifier for logging context.
           Defaults to the eml_path name.
+        presentational_hints (bool, optional): Apply HTML presentational
+          attributes such as bgcolor and width. Defaults to True.
 
     Note:
         If no text content is found, the file is skipped and a warning is
@@ -723,17 +811,16 @@ def process_eml(
     prefix = f'[{effective_logging_id}] '
 
     logger.info(f'{prefix}Processing {eml_path}')
-    # Open and parse the .eml file
-    # Try binary mode first to handle various encodings (ISO-8859-1, etc.)
-    try:
-        with open(eml_path, 'rb') as f:
-            msg = email.message_from_binary_file(f)
-    except UnicodeDecodeError:
-        # Fall back to text mode for UTF-8 encoded files
-        with open(eml_path, encoding='utf-8') as f:
-            msg = email.message_from_file(f)
-
-    email_header, html_content = _generate_html(msg, effective_logging_id)
+    # Parse the raw bytes. Byte parsing handles all encodings (ISO-8859-1,
+    # etc.) via surrogateescape, so there is no need for a text mode fallback.
+    # Parsing from the file object, rather than parsebytes(), translates CRLF
+    # line endings to LF like message_from_binary_file() always did.
+    with open(eml_path, 'rb') as f:
+        msg = _PARSER.parse(f)
+
+    email_header, html_content = _generate_html(
+        msg, effective_logging_id, unsafe
+    )
 
     # Convert to PDF if HTML content is found
     if html_content:
@@ -741,13 +828,14 @@ def process_eml(
             output_path = _get_output_base_path(
                 email_header.date, email_header.subject, output_path
             )
-        generate_pdf(
+        _render_pdf(
             html_content=html_content,
             outfile_path=output_path,
             debug_html=debug_html,
             page=page,
             unsafe=unsafe,
             logging_id=effective_logging_id,
+            presentational_hints=presentational_hints,
         )
     else:
         logger.warning(
@@ -762,6 +850,7 @@ def process_eml_bytes(
     debug_html: bool = False,
     unsafe: bool = False,
     logging_id: str | None = None,
+    presentational_hints: bool = True,
 ) -> bytes:
     """Generates a PDF from an EML file in memory.
 
@@ -774,19 +863,38 @@ def process_eml_bytes(
           Defaults to False.
         unsafe (bool, optional): Skip HTML sanitization. Defaults to False.
         logging_id (str | None, optional): Identifier for logging context.
+        presentational_hints (bool, optional): Apply HTML presentational
+          attributes such as bgcolor and width. Defaults to True.
 
     Returns (bytes): The bytes of a valid PDF file.
     """
-    message = email.message_from_bytes(contents)
-    _, html_content = _generate_html(message, logging_id)
-    return generate_pdf(
+    message = _PARSER.parsebytes(contents)
+    _, html_content = _generate_html(message, logging_id, unsafe)
+    return _render_pdf(
         html_content=html_content,
         page=page,
         unsafe=unsafe,
         logging_id=logging_id,
+        presentational_hints=presentational_hints,
     )
 
 
+def _init_worker(log_level: int, root_configured: bool) -> None:
+    """Restore the parent's logging setup in a pool worker.
+
+    Workers started with the forkserver or spawn start method don't inherit
+    the logging configuration of the parent process.
+
+    Args:
+        log_level (int): Level of this module's logger in the parent.
+        root_configured (bool): Whether the parent's root logger had
+            handlers, e.g. from logging.basicConfig() in the CLI.
+    """
+    if root_configured:
+        logging.basicConfig()
+    logger.setLevel(log_level)
+
+
 def process_all_emls_in_dir(
     input_dir: Path,
     output_dir: Path,
@@ -794,6 +902,7 @@ def process_all_emls_in_dir(
     debug_html: bool = False,
     page: str = 'a4',
     unsafe: bool = False,
+    presentational_hints: bool = True,
 ):
     """Process all EML files in a directory to PDFs.
 
@@ -803,8 +912,11 @@ def process_all_emls_in_dir(
     Multiprocessing Conditions:
         Parallel processing is used when ALL of these are true:
         - number_of_procs > 1
+        - more than one EML file is found
         - logger level is not DEBUG
 
+        The pool never has more workers than there are EML files.
+
     Reason for Limitations:
         Debug logging outputs long messages that are not multiprocess-safe
         and would become garbled when multiple processes write simultaneously.
@@ -820,11 +932,15 @@ def process_all_emls_in_dir(
         page (str): PDF page size (e.g., 'a4', 'letter'). Defaults to 'a4'
         unsafe (bool): Skip HTML sanitization (use only with trusted sources).
                        Defaults to False.
+        presentational_hints (bool): Apply HTML presentational attributes
+                                     such as bgcolor and width. Defaults to
+                                     True.
 
     Note:
         Creates output_dir with parents if it doesn't exist.
         Exits with code 1 if output directory cannot be created.
-        Uses Python's multiprocessing.Pool for parallel processing.
+        Uses Python's multiprocessing.Pool.starmap() for parallel processing,
+        with the process-wide default start method.
     """
 
     # Create output directory if it doesn't exist
@@ -836,18 +952,43 @@ def process_all_emls_in_dir(
 
     # Process all .eml files in input directory
     eml_file_paths = _get_filepaths(input_dir)
+    # Never start more workers than there are files to convert.
+    number_of_procs = min(number_of_procs, len(eml_file_paths))
     # Don't use multiprocessing if n is 1 or we output debug logging.
     # We output a lot of long debug messages. That's not multiprocess safe.
     # Messages would get garbled.
-    if number_of_procs == 1 or logger.level == logging.DEBUG:
+    if number_of_procs <= 1 or logger.level == logging.DEBUG:
         for ep in eml_file_paths:
-            process_eml(ep, Path(output_dir), page, debug_html, unsafe)
+            process_eml(
+                ep,
+                Path(output_dir),
+                page,
+                debug_html,
+                unsafe,
+                None,
+                presentational_hints,
+            )
     else:
         p_args = (
-            (ep, Path(output_dir), page, debug_html, unsafe)
+            (
+                ep,
+                Path(output_dir),
+                page,
+                debug_html,
+                unsafe,
+                None,
+                presentational_hints,
+            )
             for ep in eml_file_paths
         )
-        with Pool(number_of_procs) as p:
+        with Pool(
+            number_of_procs,
+            initializer=_init_worker,
+            initargs=(logger.level, bool(logging.getLogger().handlers)),
+        ) as p:
+            # starmap() converts all files before it raises the first
+            # exception of any worker, so one bad eml doesn't cancel the
+            # others. It already hands out the files in chunks.
             p.starmap(process_eml, p_args)
 
     print('All .eml files processed.')
@@ -876,6 +1017,48 @@ def _set_log_levels():
         lgr.setLevel(quiet_loglevel)
 
 
+@functools.lru_cache(maxsize=8)
+def _page_css(page: str) -> CSS:
+    """Return the page size and margin stylesheet for a page size.
+
+    The stylesheet is the same for every message of a batch, so it is parsed
+    once per page size and reused.
+
+    Args:
+        page (str): Page size for PDF (e.g., 'a4', 'letter').
+
+    Returns:
+        CSS: WeasyPrint stylesheet with the @page rule.
+    """
+    return CSS(string=f'@page {{ size: {page}; margin: 1cm }}')
+
+
+def _data_url_fetcher() -> Callable[[str], Any]:
+    """Return a WeasyPrint URL fetcher that only loads data: URLs.
+
+    sanitize_html() doesn't remove every remote reference, e.g. url() and
+    @import in <style> blocks, srcset or SVG <image href>. Refusing every
+    other protocol keeps WeasyPrint from fetching them. WeasyPrint logs a
+    warning for each refused URL and renders without the resource.
+
+    Returns:
+        Callable[[str], Any]: URL fetcher for HTML(url_fetcher=...).
+    """
+    try:
+        from weasyprint.urls import URLFetcher
+    except ImportError:
+        # WeasyPrint < 70 has a fetcher function instead of a class.
+        from weasyprint.urls import default_url_fetcher
+
+        def fetch(url: str, **kwargs: Any) -> Any:
+            if not url.lower().startswith('data:'):
+                raise ValueError(f'URI uses disallowed protocol: {url}')
+            return default_url_fetcher(url, **kwargs)
+
+        return fetch
+    return URLFetcher(allowed_protocols={'data'})
+
+
 @overload
 def generate_pdf(
     *,
@@ -885,6 +1068,7 @@ def generate_pdf(
     page: str = 'a4',
     unsafe: bool = False,
     logging_id: str | None = None,
+    presentational_hints: bool = True,
 ) -> None:
     pass
 
@@ -896,6 +1080,7 @@ def generate_pdf(
     page: str = 'a4',
     unsafe: bool = False,
     logging_id: str | None = None,
+    presentational_hints: bool = True,
 ) -> bytes:
     pass
 
@@ -907,6 +1092,7 @@ def generate_pdf(
     page: str = 'a4',
     unsafe: bool = False,
     logging_id: str | None = None,
+    presentational_hints: bool = True,
 ) -> bytes | None:
     """Convert HTML content to PDF with optional sanitization.
 
@@ -928,9 +1114,13 @@ def generate_pdf(
             debugging. Defaults to False.
         page (str, optional): Page size for PDF (e.g., 'a4', 'letter').
             Defaults to 'a4'.
-        unsafe (bool, optional): If True, bypasses HTML sanitization. Only use
-            when you completely trust the source. Defaults to False.
+        unsafe (bool, optional): If True, bypasses HTML sanitization and lets
+            WeasyPrint load remote resources. Only use when you completely
+            trust the source. Defaults to False.
         logging_id (str | None, optional): Identifier for logging context.
+        presentational_hints (bool, optional): Apply HTML presentational
+            attributes such as bgcolor and width. Turning this off skips
+            WeasyPrint's presentational hints stylesheet. Defaults to True.
 
     Note:
         HTML sanitization is performed by security.sanitize_html() unless
@@ -939,33 +1129,103 @@ def generate_pdf(
     Raises:
         Exception: Logs error if PDF generation fails, but does not re-raise.
     """
+    if not unsafe:
+        html_content = security.sanitize_html(html_content)
+    if outfile_path:
+        return _render_pdf(
+            html_content=html_content,
+            outfile_path=outfile_path,
+            debug_html=debug_html,
+            page=page,
+            unsafe=unsafe,
+            logging_id=logging_id,
+            presentational_hints=presentational_hints,
+        )
+    return _render_pdf(
+        html_content=html_content,
+        page=page,
+        unsafe=unsafe,
+        logging_id=logging_id,
+        presentational_hints=presentational_hints,
+    )
+
+
+@overload
+def _render_pdf(
+    *,
+    html_content: str,
+    outfile_path: Path,
+    debug_html: bool = False,
+    page: str = 'a4',
+    unsafe: bool = False,
+    logging_id: str | None = None,
+    presentational_hints: bool = True,
+) -> None:
+    pass
+
+
+@overload
+def _render_pdf(
+    *,
+    html_content: str,
+    page: str = 'a4',
+    unsafe: bool = False,
+    logging_id: str | None = None,
+    presentational_hints: bool = True,
+) -> bytes:
+    pass
+
+
+def _render_pdf(
+    html_content: str,
+    outfile_path: Path | None = None,
+    debug_html: bool = False,
+    page: str = 'a4',
+    unsafe: bool = False,
+    logging_id: str | None = None,
+    presentational_hints: bool = True,
+) -> bytes | None:
+    """Render HTML to PDF without sanitizing it.
+
+    Shared by generate_pdf(), which sanitizes its input first, and
+    process_eml(), which only sanitizes the email body while generating the
+    HTML. Unless unsafe, WeasyPrint only loads data: URLs. See generate_pdf()
+    for the arguments.
+
+    Returns:
+        bytes | None: The PDF if no outfile_path is given, else None. Also
+            None if rendering failed; the error is logged.
+    """
     # Build logging prefix
     prefix = f'[{logging_id}] ' if logging_id else ''
 
     _set_log_levels()
 
-    if not unsafe:
-        html_content = security.sanitize_html(html_content)
     try:
         if debug_html and outfile_path:
             html_file = outfile_path.parent / Path(outfile_path.name + '.html')
             with open(html_file, 'w', encoding='utf-8') as of:
                 of.write(html_content)
-        html = HTML(string=html_content)
-        css = CSS(string=f'@page {{ size: {page}; margin: 1cm }}')
+        if unsafe:
+            html = HTML(string=html_content)
+        else:
+            html = HTML(string=html_content, url_fetcher=_data_url_fetcher())
+        css = _page_css(page)
 
         if outfile_path:
             with _get_exclusive_outfile(outfile_path) as outfile:
                 html.write_pdf(
                     target=outfile,
-                    presentational_hints=True,
+                    presentational_hints=presentational_hints,
                     stylesheets=[css],
                 )
             logger.info(f'{prefix}Converted to PDF successfully.')
             return None
         else:
             return html.write_pdf(
-                target=None, presentational_hints=True, stylesheets=[css]
+                target=None,
+                presentational_hints=presentational_hints,
+                stylesheets=[css],
             )
     except Exception as e:
         logger.error(f'{prefix}Failed to convert: {str(e)}')
@@ -998,7 +1258,23 @@ def header_to_html(header_str: str) -> str:
         'Hello World'
         >>> header_to_html('Test <tag>')
         'Test &lt;tag&gt;'
+
+    Note:
+        Results are cached per process, as batches tend to repeat the same
+        senders and recipients.
     """
+    # Header objects, from programmatically built messages, are unhashable.
+    if isinstance(header_str, str):
+        # decode_header() returns strings without RFC 2047 encoded words
+        # unchanged, so there is nothing to decode.
+        if '=?' not in header_str:
+            return escape(header_str)
+        return _cached_header_to_html(header_str)
+    return _header_to_html(header_str)
+
+
+def _header_to_html(header_str: str) -> str:
+    """Uncached implementation of header_to_html()."""
     headers = email.header.decode_header(header_str)
     headers_as_string = ''
     # decoded headers can have multiple parts. Concat them.
@@ -1013,3 +1289,9 @@ def header_to_html(header_str: str) -> str:
             headers_as_string += str(head[0], enc)
     # eml headers can contain &, <, >
     return escape(headers_as_string)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_header_to_html(header_str: str) -> str:
+    """header_to_html() for plain string headers, cached per process."""
+    return _header_to_html(header_str)
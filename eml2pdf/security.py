@@ -1,6 +1,56 @@
 """Security related html sanitization."""
 
-from bs4 import BeautifulSoup
+import re
+
+from lxml import etree
+from lxml import html as lxml_html
+
+# Tags that are removed together with everything inside them.
+_RISKY_TAGS = frozenset(
+    {
+        'script',
+        'iframe',
+        'object',
+        'embed',
+        'video',
+        'audio',
+        'form',
+        'meta',
+        'link',
+    }
+)
+
+# Prefixes of remote resource URLs.
+_REMOTE_PREFIXES = ('http://', 'https://')
+
+# Prefixes of event handler and custom data attribute names.
+_UNSAFE_ATTR_PREFIXES = ('on', 'data-')
+
+# HTML parser for the UTF-8 encoded email body. huge_tree lifts libxml2's
+# 10 MB text node limit, which inlined data URI images can exceed. Without
+# it the document is silently truncated at the oversized node.
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8', huge_tree=True)
+
+# </body> and </html> end tags. libxml2 drops everything after them, like
+# the next document when text/html parts are full documents (Apple Mail).
+_DOC_END_RE = re.compile(r'</(?:body|html)\s*>', re.IGNORECASE)
+
+
+def _encode_utf8(html_content: str) -> bytes:
+    """Encode html_content to UTF-8, repairing surrogate code points.
+
+    Decoding with unicode-escape turns escaped astral characters, such as
+    emoji, into surrogate pairs that UTF-8 can't encode. Those pairs are
+    folded back into their character. Any lone surrogate left becomes
+    U+FFFD.
+    """
+    try:
+        return html_content.encode('utf-8')
+    except UnicodeEncodeError:
+        folded = html_content.encode('utf-16', 'surrogatepass').decode(
+            'utf-16', 'replace'
+        )
+        return folded.encode('utf-8')
 
 
 # This function is not that complex so no C901
@@ -40,6 +90,8 @@ def sanitize_html(html_content):  # noqa C901
     Note:
         Only embedded images (data URIs or CID references) are preserved.
         Remote images are completely removed to prevent tracking.
+        Content without any tag is returned as is, without parsing.
+        Concatenated HTML documents are merged into a single body.
 
     Example:
         >>> html = (
@@ -49,44 +101,48 @@ def sanitize_html(html_content):  # noqa C901
         >>> sanitize_html(html)
         ''
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    # Remove risky tags
-    risky_tags = [
-        'script',
-        'iframe',
-        'object',
-        'embed',
-        'video',
-        'audio',
-        'form',
-        'meta',
-        'link',
-    ]
-    for tag in soup.find_all(risky_tags):
-        tag.decompose()
-
-    # Remove remote images
-    for img in soup.find_all('img'):
-        src = img.get('src', '')
-        if src.startswith('http://') or src.startswith('https://'):
-            img.decompose()
-
-    # Sanitize styles
-    for tag in soup.find_all(style=True):
-        if 'url(' in tag['style']:
-            tag['style'] = ''
-
-    # Sanitize links
-    for a in soup.find_all('a'):
-        href = a.get('href', '')
-        if href.startswith(('http://', 'https://')):
-            a['href'] = '#'
-
-    # Remove event handlers and custom data attributes
-    for tag in soup.find_all():
-        for attr in list(tag.attrs):
-            if attr.startswith('on') or attr.startswith('data-'):
-                del tag[attr]
-
-    return str(soup)
+    # Without a tag there is nothing to remove or neutralize.
+    if '<' not in html_content:
+        return html_content
+
+    # Without the end tags, libxml2 parses concatenated documents into one
+    # body. It closes the body and html elements itself.
+    html_content = _DOC_END_RE.sub('', html_content)
+
+    try:
+        # Parse UTF-8 bytes, as lxml refuses str input that starts with an
+        # XML declaration naming an encoding, like XHTML emails do.
+        doc = lxml_html.document_fromstring(
+            _encode_utf8(html_content), parser=_HTML_PARSER
+        )
+    except etree.ParserError:
+        # Nothing but whitespace or comments, so nothing to render.
+        return ''
+
+    # Remove risky tags with everything inside them, in libxml2. Their tail
+    # text, the text after the closing tag, is kept.
+    etree.strip_elements(doc, *_RISKY_TAGS, with_tail=False)
+
+    # Snapshot the elements first so they can be removed while iterating.
+    for el in list(doc.iter(etree.Element)):
+        # Remove remote images
+        if el.tag == 'img' and el.get('src', '').startswith(_REMOTE_PREFIXES):
+            el.drop_tree()
+            continue
+
+        # Neutralize external links
+        if el.tag == 'a' and el.get('href', '').startswith(_REMOTE_PREFIXES):
+            el.set('href', '#')
+
+        # Sanitize styles
+        if 'url(' in el.get('style', ''):
+            el.set('style', '')
+
+        # Remove event handlers and custom data attributes
+        attrib = el.attrib
+        for attr in [a for a in attrib if a.startswith(_UNSAFE_ATTR_PREFIXES)]:
+            del attrib[attr]
+
+    # Serialize the root element only. The tree would add a default HTML 4
+    # doctype to documents that didn't have one.
+    return lxml_html.tostring(doc, encoding='unicode')
@@ -57,14 +57,14 @@ args = parser.parse_args()
 PYPI_TO_DEBIAN = {
     'weasyprint': 'weasyprint',
     'markdown': 'python3-markdown',
-    'beautifulsoup4': 'python3-bs4',
-    'hurry.filesize': 'python3-hurry.filesize',
+    'lxml': 'python3-lxml',
 }
 
 # Development dependencies
 DEV_DEPS = {
     'pytest': 'python3-pytest',
     'pytest-cov': 'python3-pytest-cov',
+    'pytest-xdist': 'python3-pytest-xdist',
     'sphinx': 'python3-sphinx',
     'sphinx-rtd-theme': 'python3-sphinx-rtd-theme',
     'myst-parser': 'python3-myst-parser',
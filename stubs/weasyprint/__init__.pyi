@@ -4,18 +4,21 @@ This stub file provides type information for the WeasyPrint classes
 and methods actually used in the eml2pdf package to enable type checking.
 """
 
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from io import IOBase
 from typing import Any
 
 class HTML:
     """WeasyPrint HTML document class."""
 
-    def __init__(self, string: str) -> None:
+    def __init__(
+        self, string: str, url_fetcher: Callable[[str], Any] = ...
+    ) -> None:
         """Initialize HTML from a string.
 
         Args:
             string: HTML content as a string.
+            url_fetcher: Function called to fetch external resources.
         """
         ...
 
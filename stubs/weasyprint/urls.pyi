@@ -0,0 +1,23 @@
+"""Type stubs for weasyprint.urls - minimal subset used by eml2pdf."""
+
+from collections.abc import Iterable
+from typing import Any
+
+class URLFetcher:
+    """WeasyPrint URL fetcher class (WeasyPrint >= 70)."""
+
+    def __init__(self, allowed_protocols: Iterable[str] | None = ...) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            allowed_protocols: Protocols allowed to fetch, None for all.
+        """
+        ...
+
+    def __call__(self, url: str) -> Any:
+        """Fetch a URL."""
+        ...
+
+def default_url_fetcher(url: str, **kwargs: Any) -> Any:
+    """Fetch a URL (WeasyPrint < 70)."""
+    ...
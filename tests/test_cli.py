@@ -1,459 +1,275 @@
 """Unit tests for CLI argument parsing and main function."""
 
+import argparse
+import functools
 import logging
-import unittest
+import sys
 from pathlib import Path
-from unittest.mock import patch
-
-from eml2pdf.eml2pdf import get_args, main
-
-
-class TestGetArgs(unittest.TestCase):
-    """Test command-line argument parsing."""
-
-    def test_convert_dir_basic_arguments(self):
-        """Test parsing of required input_dir and output_dir arguments."""
-        with patch('sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output']):
-            args = get_args()
-            self.assertEqual(args.input_dir, Path('input'))
-            self.assertEqual(args.output_dir, Path('output'))
-
-    def test_convert_dir_debug_html_flag(self):
-        """Test -d/--debug_html flag."""
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_dir', 'input', 'output', '--debug_html'],
-        ):
-            args = get_args()
-            self.assertTrue(args.debug_html)
-
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output', '-d']
-        ):
-            args = get_args()
-            self.assertTrue(args.debug_html)
-
-    def test_convert_dir_debug_html_default(self):
-        """Test debug_html defaults to False."""
-        with patch('sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output']):
-            args = get_args()
-            self.assertFalse(args.debug_html)
-
-    def test_convert_dir_number_of_procs_flag(self):
-        """Test -n/--number-of-procs flag."""
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_dir', 'input', 'output', '-n', '4'],
-        ):
-            args = get_args()
-            self.assertEqual(args.number_of_procs, 4)
-
-        with patch(
-            'sys.argv',
-            [
-                'eml2pdf',
-                'convert_dir',
-                'input',
-                'output',
-                '--number-of-procs',
-                '8',
-            ],
-        ):
-            args = get_args()
-            self.assertEqual(args.number_of_procs, 8)
-
-    def test_convert_dir_number_of_procs_default(self):
-        """Test number_of_procs has a default value."""
-        with patch('sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output']):
-            args = get_args()
-            # Should be set to CPU count, just verify it's a positive integer
-            self.assertIsInstance(args.number_of_procs, int)
-            self.assertGreater(args.number_of_procs, 0)
-
-    def test_convert_dir_page_size_flag(self):
-        """Test -p/--page flag."""
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_dir', 'input', 'output', '-p', 'letter'],
-        ):
-            args = get_args()
-            self.assertEqual(args.page, 'letter')
-
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_dir', 'input', 'output', '--page', 'a3'],
-        ):
-            args = get_args()
-            self.assertEqual(args.page, 'a3')
-
-        with patch(
-            'sys.argv',
-            [
-                'eml2pdf',
-                'convert_dir',
-                'input',
-                'output',
-                '-p',
-                'a4 landscape',
-            ],
-        ):
-            args = get_args()
-            self.assertEqual(args.page, 'a4 landscape')
-
-    def test_convert_dir_page_size_default(self):
-        """Test page size defaults to 'a4'."""
-        with patch('sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output']):
-            args = get_args()
-            self.assertEqual(args.page, 'a4')
-
-    def test_convert_dir_unsafe_flag(self):
-        """Test --unsafe flag."""
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_dir', 'input', 'output', '--unsafe'],
-        ):
-            args = get_args()
-            self.assertTrue(args.unsafe)
-
-    def test_convert_dir_unsafe_default(self):
-        """Test unsafe defaults to False."""
-        with patch('sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output']):
-            args = get_args()
-            self.assertFalse(args.unsafe)
-
-    def test_convert_dir_verbose_flag(self):
-        """Test -v/--verbose flag."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output', '-v']
-        ):
-            args = get_args()
-            self.assertTrue(args.verbose)
-
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_dir', 'input', 'output', '--verbose'],
-        ):
-            args = get_args()
-            self.assertTrue(args.verbose)
-
-    def test_convert_dir_verbose_default(self):
-        """Test verbose defaults to False."""
-        with patch('sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output']):
-            args = get_args()
-            self.assertFalse(args.verbose)
-
-    def test_convert_dir_quiet_flag(self):
-        """Test -q/--quiet flag."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output', '-q']
-        ):
-            args = get_args()
-            self.assertTrue(args.quiet)
-
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_dir', 'input', 'output', '--quiet'],
-        ):
-            args = get_args()
-            self.assertTrue(args.quiet)
-
-    def test_convert_dir_quiet_default(self):
-        """Test quiet defaults to False."""
-        with patch('sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output']):
-            args = get_args()
-            self.assertFalse(args.quiet)
-
-    def test_convert_dir_combined_flags(self):
-        """Test multiple flags can be combined."""
-        with patch(
-            'sys.argv',
-            [
-                'eml2pdf',
-                'convert_dir',
-                'input',
-                'output',
-                '-d',
-                '-v',
-                '--unsafe',
-                '-n',
-                '2',
-                '-p',
-                'letter',
-            ],
-        ):
-            args = get_args()
-            self.assertTrue(args.debug_html)
-            self.assertTrue(args.verbose)
-            self.assertTrue(args.unsafe)
-            self.assertEqual(args.number_of_procs, 2)
-            self.assertEqual(args.page, 'letter')
-            self.assertFalse(args.quiet)
-
-    def test_convert_file_basic_arguments(self):
-        """Test parsing of input_file and output_file for convert_file."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf']
-        ):
-            args = get_args()
-            self.assertEqual(args.input_file, Path('input.eml'))
-            self.assertEqual(args.output_file, Path('output.pdf'))
-
-    def test_convert_file_debug_html_flag(self):
-        """Test -d/--debug_html flag for convert_file."""
-        with patch(
-            'sys.argv',
-            [
-                'eml2pdf',
-                'convert_file',
-                'input.eml',
-                'output.pdf',
-                '--debug_html',
-            ],
-        ):
-            args = get_args()
-            self.assertTrue(args.debug_html)
-
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf', '-d'],
-        ):
-            args = get_args()
-            self.assertTrue(args.debug_html)
-
-    def test_convert_file_debug_html_default(self):
-        """Test debug_html defaults to False for convert_file."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf']
-        ):
-            args = get_args()
-            self.assertFalse(args.debug_html)
-
-    def test_convert_file_page_size_flag(self):
-        """Test -p/--page flag for convert_file."""
-        with patch(
-            'sys.argv',
-            [
-                'eml2pdf',
-                'convert_file',
-                'input.eml',
-                'output.pdf',
-                '-p',
-                'letter',
-            ],
-        ):
-            args = get_args()
-            self.assertEqual(args.page, 'letter')
-
-        with patch(
-            'sys.argv',
-            [
-                'eml2pdf',
-                'convert_file',
-                'input.eml',
-                'output.pdf',
-                '--page',
-                'a3',
-            ],
-        ):
-            args = get_args()
-            self.assertEqual(args.page, 'a3')
-
-    def test_convert_file_page_size_default(self):
-        """Test page size defaults to 'a4' for convert_file."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf']
-        ):
-            args = get_args()
-            self.assertEqual(args.page, 'a4')
-
-    def test_convert_file_unsafe_flag(self):
-        """Test --unsafe flag for convert_file."""
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf', '--unsafe'],
-        ):
-            args = get_args()
-            self.assertTrue(args.unsafe)
-
-    def test_convert_file_unsafe_default(self):
-        """Test unsafe defaults to False for convert_file."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf']
-        ):
-            args = get_args()
-            self.assertFalse(args.unsafe)
-
-    def test_convert_file_verbose_flag(self):
-        """Test -v/--verbose flag for convert_file."""
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf', '-v'],
-        ):
-            args = get_args()
-            self.assertTrue(args.verbose)
-
-        with patch(
-            'sys.argv',
-            [
-                'eml2pdf',
-                'convert_file',
-                'input.eml',
-                'output.pdf',
-                '--verbose',
-            ],
-        ):
-            args = get_args()
-            self.assertTrue(args.verbose)
-
-    def test_convert_file_verbose_default(self):
-        """Test verbose defaults to False for convert_file."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf']
-        ):
-            args = get_args()
-            self.assertFalse(args.verbose)
-
-    def test_convert_file_quiet_flag(self):
-        """Test -q/--quiet flag for convert_file."""
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf', '-q'],
-        ):
-            args = get_args()
-            self.assertTrue(args.quiet)
-
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf', '--quiet'],
-        ):
-            args = get_args()
-            self.assertTrue(args.quiet)
-
-    def test_convert_file_quiet_default(self):
-        """Test quiet defaults to False for convert_file."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf']
-        ):
-            args = get_args()
-            self.assertFalse(args.quiet)
-
-    def test_convert_file_combined_flags(self):
-        """Test multiple flags can be combined for convert_file."""
-        with patch(
-            'sys.argv',
-            [
-                'eml2pdf',
-                'convert_file',
-                'input.eml',
-                'output.pdf',
-                '-d',
-                '-v',
-                '--unsafe',
-                '-p',
-                'letter',
-            ],
-        ):
-            args = get_args()
-            self.assertTrue(args.debug_html)
-            self.assertTrue(args.verbose)
-            self.assertTrue(args.unsafe)
-            self.assertEqual(args.page, 'letter')
-            self.assertFalse(args.quiet)
-
-
-class TestMain(unittest.TestCase):
-    """Test main() function.
-
-    This just tests that main passes args correctly for some basic cases.
-    """
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from eml2pdf import libeml2pdf
+from eml2pdf.eml2pdf import _use_forkserver, get_args, loggers, main
+
+# Minimal command lines for both subcommands.
+DIR_ARGV = ('eml2pdf', 'convert_dir', 'input', 'output')
+FILE_ARGV = ('eml2pdf', 'convert_file', 'input.eml', 'output.pdf')
 
-    @patch('eml2pdf.eml2pdf.libeml2pdf.process_all_emls_in_dir')
-    def test_main_convert_dir_basic(self, mock_process):
-        """Test main() calls process_all_emls with correct arguments."""
-        with patch('sys.argv', ['eml2pdf', 'convert_dir', 'input', 'output']):
-            main()
-            mock_process.assert_called_once()
-            call_args = mock_process.call_args[0]
-            self.assertEqual(call_args[0], Path('input'))
-            self.assertEqual(call_args[1], Path('output'))
-
-    @patch('eml2pdf.eml2pdf.libeml2pdf.process_eml')
-    def test_main_convert_file_with_debug_html(self, mock_process):
-        """Test main() passes debug_html flag correctly."""
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_file', 'input', 'output', '-d']
-        ):
-            main()
-            call_args = mock_process.call_args[0]
-            # debug_html is the 4th argument (index 3)
-            self.assertTrue(call_args[3])
-
-
-class TestLogLevelPropagation(unittest.TestCase):
-    """Test that CLI log level settings propagate to libeml2pdf."""
-
-    @patch('eml2pdf.eml2pdf.libeml2pdf.process_eml')
-    def test_verbose_sets_debug_level(self, mock_process):
-        """Test --verbose sets logger level to DEBUG."""
-        import eml2pdf.libeml2pdf as lib
-
-        orig_level = lib.logger.level
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf', '-v'],
-        ):
-            main()
-            self.assertEqual(lib.logger.level, logging.DEBUG)
-        lib.logger.setLevel(orig_level)
-
-    @patch('eml2pdf.eml2pdf.libeml2pdf.process_eml')
-    def test_quiet_sets_error_level(self, mock_process):
-        """Test --quiet sets logger level to ERROR."""
-        import eml2pdf.libeml2pdf as lib
-
-        orig_level = lib.logger.level
-        with patch(
-            'sys.argv',
-            ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf', '-q'],
-        ):
-            main()
-            self.assertEqual(lib.logger.level, logging.ERROR)
-        lib.logger.setLevel(orig_level)
-
-    @patch('eml2pdf.eml2pdf.libeml2pdf.process_eml')
-    def test_default_sets_info_level(self, mock_process):
-        """Test default (no flags) sets logger level to INFO."""
-        import eml2pdf.libeml2pdf as lib
-
-        orig_level = lib.logger.level
-        with patch(
-            'sys.argv', ['eml2pdf', 'convert_file', 'input.eml', 'output.pdf']
-        ):
-            main()
-            self.assertEqual(lib.logger.level, logging.INFO)
-        lib.logger.setLevel(orig_level)
-
-    @patch('eml2pdf.eml2pdf.libeml2pdf.process_eml')
-    def test_verbose_quiet_verbose_wins(self, mock_process):
-        """Test --verbose and --quiet together, --verbose wins with warning."""
-        import eml2pdf.libeml2pdf as lib
-
-        orig_level = lib.logger.level
-        with (
-            patch(
-                'sys.argv',
-                [
-                    'eml2pdf',
-                    'convert_file',
-                    'input.eml',
-                    'output.pdf',
-                    '-v',
-                    '-q',
-                ],
-            ),
-            patch('logging.warning') as mock_warning,
-        ):
-            main()
-            mock_warning.assert_called_once()
-            self.assertEqual(lib.logger.level, logging.DEBUG)
-        lib.logger.setLevel(orig_level)
+
+@functools.cache
+def parse_args(argv: tuple[str, ...]) -> argparse.Namespace:
+    """Return get_args() for argv, parsed once per distinct argv.
+
+    Many cases only read one attribute of the same command line. The
+    returned Namespace is shared, so tests must not modify it.
+    """
+    with patch.object(sys, 'argv', list(argv)):
+        return get_args()
+
+
+@pytest.fixture
+def set_argv(monkeypatch):
+    """Return a function that sets sys.argv for the current test."""
+
+    def _set_argv(argv):
+        monkeypatch.setattr(sys, 'argv', list(argv))
+
+    return _set_argv
+
+
+@pytest.fixture
+def main_mocks(monkeypatch):
+    """Replace the functions main() hands off to with mocks."""
+    mocks = SimpleNamespace(
+        process_all_emls_in_dir=MagicMock(),
+        process_eml=MagicMock(),
+        use_forkserver=MagicMock(),
+    )
+    monkeypatch.setattr(
+        libeml2pdf, 'process_all_emls_in_dir', mocks.process_all_emls_in_dir
+    )
+    monkeypatch.setattr(libeml2pdf, 'process_eml', mocks.process_eml)
+    monkeypatch.setattr(
+        'eml2pdf.eml2pdf._use_forkserver', mocks.use_forkserver
+    )
+    return mocks
+
+
+@pytest.mark.parametrize(
+    'argv', [DIR_ARGV, FILE_ARGV], ids=['convert_dir', 'convert_file']
+)
+@pytest.mark.parametrize(
+    ('flags', 'attr', 'expected'),
+    [
+        ([], 'debug_html', False),
+        (['-d'], 'debug_html', True),
+        (['--debug_html'], 'debug_html', True),
+        ([], 'page', 'a4'),
+        (['-p', 'letter'], 'page', 'letter'),
+        (['--page', 'a3'], 'page', 'a3'),
+        (['-p', 'a4 landscape'], 'page', 'a4 landscape'),
+        ([], 'unsafe', False),
+        (['--unsafe'], 'unsafe', True),
+        ([], 'presentational_hints', True),
+        (['--no-presentational-hints'], 'presentational_hints', False),
+        ([], 'verbose', False),
+        (['-v'], 'verbose', True),
+        (['--verbose'], 'verbose', True),
+        ([], 'quiet', False),
+        (['-q'], 'quiet', True),
+        (['--quiet'], 'quiet', True),
+    ],
+)
+def test_get_args_shared_options(argv, flags, attr, expected):
+    """Test the options shared by convert_dir and convert_file."""
+    assert getattr(parse_args((*argv, *flags)), attr) == expected
+
+
+# (id, argv, expected attributes) for the subcommand arguments and combined
+# flags. Tuples, built once at import.
+ARGV_CASES = (
+    (
+        'dir_basic',
+        DIR_ARGV,
+        {'input_dir': Path('input'), 'output_dir': Path('output')},
+    ),
+    ('dir_n', (*DIR_ARGV, '-n', '4'), {'number_of_procs': 4}),
+    (
+        'dir_number_of_procs',
+        (*DIR_ARGV, '--number-of-procs', '8'),
+        {'number_of_procs': 8},
+    ),
+    (
+        'dir_combined',
+        (*DIR_ARGV, '-d', '-v', '--unsafe', '-n', '2', '-p', 'letter'),
+        {
+            'debug_html': True,
+            'verbose': True,
+            'unsafe': True,
+            'number_of_procs': 2,
+            'page': 'letter',
+            'quiet': False,
+        },
+    ),
+    (
+        'file_basic',
+        FILE_ARGV,
+        {'input_file': Path('input.eml'), 'output_file': Path('output.pdf')},
+    ),
+    (
+        'file_combined',
+        (*FILE_ARGV, '-d', '-v', '--unsafe', '-p', 'letter'),
+        {
+            'debug_html': True,
+            'verbose': True,
+            'unsafe': True,
+            'page': 'letter',
+            'quiet': False,
+        },
+    ),
+)
+
+
+@pytest.mark.parametrize(
+    ('argv', 'expected'),
+    [(argv, expected) for _, argv, expected in ARGV_CASES],
+    ids=[case_id for case_id, _, _ in ARGV_CASES],
+)
+def test_get_args(argv, expected):
+    """Test subcommand arguments and combined flags."""
+    args = parse_args(argv)
+    assert {attr: getattr(args, attr) for attr in expected} == expected
+
+
+def test_get_args_number_of_procs_default():
+    """Test number_of_procs defaults to a positive CPU count."""
+    number_of_procs = parse_args(DIR_ARGV).number_of_procs
+    assert isinstance(number_of_procs, int)
+    assert number_of_procs > 0
+
+
+# main() just has to pass the parsed arguments on. Positions index the
+# positional arguments of the library call, names its keyword arguments.
+@pytest.mark.parametrize(
+    ('flags', 'arg', 'expected'),
+    [
+        ([], 0, Path('input')),
+        ([], 1, Path('output')),
+        (['-n', '3'], 2, 3),
+        (['-d'], 3, True),
+        (['-p', 'letter'], 4, 'letter'),
+        (['--unsafe'], 5, True),
+        (['--no-presentational-hints'], 6, False),
+    ],
+)
+def test_main_convert_dir(main_mocks, set_argv, flags, arg, expected):
+    """Test main() passes convert_dir arguments to process_all_emls."""
+    set_argv(['eml2pdf', 'convert_dir', 'input', 'output', *flags])
+    main()
+    main_mocks.use_forkserver.assert_called_once()
+    main_mocks.process_all_emls_in_dir.assert_called_once()
+    call = main_mocks.process_all_emls_in_dir.call_args
+    assert call.args[arg] == expected
+
+
+@pytest.mark.parametrize(
+    ('flags', 'arg', 'expected'),
+    [
+        ([], 0, Path('input')),
+        ([], 1, Path('output')),
+        (['-p', 'letter'], 2, 'letter'),
+        (['-d'], 3, True),
+        (['--unsafe'], 4, True),
+        (['--no-presentational-hints'], 'presentational_hints', False),
+    ],
+)
+def test_main_convert_file(main_mocks, set_argv, flags, arg, expected):
+    """Test main() passes convert_file arguments to process_eml."""
+    set_argv(['eml2pdf', 'convert_file', 'input', 'output', *flags])
+    main()
+    main_mocks.use_forkserver.assert_not_called()
+    main_mocks.process_eml.assert_called_once()
+    call = main_mocks.process_eml.call_args
+    value = call.kwargs[arg] if isinstance(arg, str) else call.args[arg]
+    assert value == expected
+
+
+@pytest.fixture
+def start_method_mocks(monkeypatch):
+    """Replace the multiprocessing start method setters with mocks."""
+    mocks = SimpleNamespace(
+        set_start_method=MagicMock(),
+        set_forkserver_preload=MagicMock(),
+    )
+    monkeypatch.setattr(
+        'multiprocessing.set_start_method', mocks.set_start_method
+    )
+    monkeypatch.setattr(
+        'multiprocessing.set_forkserver_preload', mocks.set_forkserver_preload
+    )
+    return mocks
+
+
+def test_use_forkserver_with_preload(monkeypatch, start_method_mocks):
+    """Test forkserver is selected and libeml2pdf preloaded."""
+    monkeypatch.setattr(
+        'multiprocessing.get_all_start_methods',
+        lambda: ['fork', 'spawn', 'forkserver'],
+    )
+    _use_forkserver()
+    start_method_mocks.set_start_method.assert_called_once_with(
+        'forkserver', force=True
+    )
+    start_method_mocks.set_forkserver_preload.assert_called_once_with(
+        ['eml2pdf.libeml2pdf']
+    )
+
+
+def test_use_forkserver_platform_default(monkeypatch, start_method_mocks):
+    """Test the start method is left alone without forkserver."""
+    monkeypatch.setattr(
+        'multiprocessing.get_all_start_methods', lambda: ['spawn']
+    )
+    _use_forkserver()
+    start_method_mocks.set_start_method.assert_not_called()
+
+
+@pytest.fixture
+def restore_log_levels():
+    """Restore the log levels that main() sets on the eml2pdf loggers."""
+    levels = [lgr.level for lgr in loggers]
+    yield
+    for lgr, level in zip(loggers, levels, strict=True):
+        lgr.setLevel(level)
+
+
+@pytest.mark.parametrize(
+    ('flags', 'level'),
+    [
+        (['-v'], logging.DEBUG),
+        (['-q'], logging.ERROR),
+        ([], logging.INFO),
+    ],
+    ids=['verbose', 'quiet', 'default'],
+)
+def test_main_sets_log_level(
+    main_mocks, set_argv, restore_log_levels, flags, level
+):
+    """Test CLI log level settings propagate to libeml2pdf."""
+    set_argv([*FILE_ARGV, *flags])
+    main()
+    assert libeml2pdf.logger.level == level
+
+
+def test_main_verbose_quiet_verbose_wins(
+    monkeypatch, main_mocks, set_argv, restore_log_levels
+):
+    """Test --verbose and --quiet together, --verbose wins with warning."""
+    mock_warning = MagicMock()
+    monkeypatch.setattr('logging.warning', mock_warning)
+    set_argv([*FILE_ARGV, '-v', '-q'])
+    main()
+    mock_warning.assert_called_once()
+    assert libeml2pdf.logger.level == logging.DEBUG
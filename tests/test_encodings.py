@@ -1,11 +1,13 @@
 import email
+import email.parser
+import email.policy
 import hashlib
 import os
-import sys
-import unittest
 from html import escape
 from pathlib import Path
 
+import pytest
+
 from eml2pdf import libeml2pdf
 
 from .common import Eml
@@ -13,6 +15,9 @@ from .common import mails as base_mails
 
 eml_path = Path('tests/test_data')
 
+# Parser for the test data emls, with the policy process_eml() uses.
+PARSER = email.parser.BytesParser(policy=email.policy.compat32)
+
 # These mails definitions are used to generate emls in test data
 mails = {m.filename: m for m in base_mails}
 
@@ -52,96 +57,139 @@ def get_tgt_html(html_path: Path) -> str:
     return html_str
 
 
-class TestEmls(unittest.TestCase):
-    def test_headers(self):
-        """Headers should remain the same from src data and eml files."""
-        infiles = libeml2pdf._get_filepaths(Path(os.getcwd()))
-        for eml in infiles:
-            with open(eml) as f:
-                eml_msg = email.message_from_file(f)
-            src_eml = more_mails.get(eml.name)
-            if not src_eml:
-                continue
-            with self.subTest(eml=eml):
-                # Header fields are not named consistently. Tuples the contain
-                # header attr names depending on context.
-                for h in [
-                    ('_from', 'from'),
-                    ('to', 'to'),
-                    ('subject', 'subject'),
-                ]:
-                    src_head = escape(getattr(src_eml, h[0]))
-                    eml_head = libeml2pdf.header_to_html(eml_msg.get(h[1]))
-                    self.assertEqual(src_head, eml_head)
-
-    def test_plain_text(self):
-        """Plain text file body should render as html."""
-        pt_emls = [
-            (
-                'plain_lorem_ipsum.eml',
-                get_tgt_html(Path('plain_lorem_ipsum.html')),
-            ),
-            ('plain_text.eml', get_tgt_html(Path('plain_text.html'))),
-            (
-                'mixed_plain_html_smiley_embedded.eml',
-                get_tgt_html(Path('mixed_plain_html_smiley_embedded.html')),
-            ),
-            (
-                'plain_native_utf8.eml',
-                get_tgt_html(Path('plain_native_utf8.html')),
-            ),
-        ]
-
-        for eml in pt_emls:
-            with open(eml_path / Path(eml[0]), 'rb') as f:
-                eml_msg = email.message_from_binary_file(f)
-            with self.subTest(eml=eml[0]):
-                eml_html = libeml2pdf._walk_eml(eml_msg)[0]
-                self.assertEqual(eml_html, eml[1].strip())
-
-    def test_attachments(self):
-        """Check if attachments are complete with right name, size and hash."""
-        at_eml = 'attachments.eml'
-        with open(eml_path / Path(at_eml), 'rb') as f:
-            eml_msg = email.message_from_binary_file(f)
-        ats_from_eml = libeml2pdf._walk_eml(eml_msg)[1]
-        for at in ats_from_eml:
-            with self.subTest(at=at):
-                name = at.name
-                f_path = eml_path / Path(name)
-                with open(f_path, 'rb') as f:
-                    f_data = f.read()
-                    f_md5sum = hashlib.md5(f_data).hexdigest()
-                    f_size = sys.getsizeof(f_data)
-                self.assertEqual(f_md5sum, at.md5sum)
-                self.assertEqual(f_size, at.size)
-
-    def test_inline_doc_is_captured_as_attachment(self):
-        """Verify that a .doc file with 'Content-Disposition: inline'
-        is correctly identified as an attachment.
-        """
-        at_eml = 'email_with_doc_attachment.eml'
-        with open(eml_path / Path(at_eml), 'rb') as f:
-            eml_msg = email.message_from_binary_file(f)
-        attachments_from_eml = libeml2pdf._walk_eml(eml_msg)[1]
-        # Check if the .doc was found in the attachments list
-        self.assertEqual(
-            len(attachments_from_eml),
-            1,
-            f'Should have found 1 attachment {attachments_from_eml}',
-        )
-
-    def test_plain_and_html_inline(self):
-        """Emls with both plain text and html inline parts render once."""
-        phi_eml = (
-            'plain_and_html_inline.eml',
-            get_tgt_html(Path('plain_and_html_inline.html')),
-        )
-        with open(eml_path / Path(phi_eml[0]), 'rb') as f:
-            eml_msg = email.message_from_binary_file(f)
-            eml_html = libeml2pdf._walk_eml(eml_msg)[0]
-            self.assertEqual(eml_html.strip(), phi_eml[1].strip())
-
-
-if __name__ == '__main__':
-    unittest.main()
+def assert_same_html(actual: str, expected: str) -> None:
+    """Fail with the first difference instead of a diff of the whole HTML.
+
+    The expected HTML runs up to several KB of base64 image data, which
+    makes a full assertion diff slow and unreadable.
+    """
+    if actual == expected:
+        return
+    offset = len(os.path.commonprefix([actual, expected]))
+    start = max(offset - 40, 0)
+    pytest.fail(
+        f'HTML differs at offset {offset} '
+        f'(lengths {len(actual)} and {len(expected)}):\n'
+        f'  actual:   {actual[start : offset + 40]!r}\n'
+        f'  expected: {expected[start : offset + 40]!r}'
+    )
+
+
+# Header fields are not named consistently. Tuples that contain the header
+# attr names of the Eml definitions and of the eml files.
+HEADER_FIELDS = [
+    ('_from', 'from'),
+    ('to', 'to'),
+    ('subject', 'subject'),
+]
+
+# The Eml header values, HTML-escaped once at import.
+ESCAPED = {
+    name: {
+        src_attr: escape(getattr(m, src_attr)) for src_attr, _ in HEADER_FIELDS
+    }
+    for name, m in more_mails.items()
+}
+
+# One case per eml file and header field. Sorted, as every pytest-xdist
+# worker has to collect the tests in the same order.
+HEADER_CASES = [
+    (name, src_attr, eml_attr)
+    for name in sorted(
+        p.name
+        for p in libeml2pdf._get_filepaths(eml_path)
+        if p.name in more_mails
+    )
+    for src_attr, eml_attr in HEADER_FIELDS
+]
+
+# Emls with a plain text body and the HTML it should render to.
+PLAIN_TEXT_EMLS = [
+    ('plain_lorem_ipsum.eml', 'plain_lorem_ipsum.html'),
+    ('plain_text.eml', 'plain_text.html'),
+    (
+        'mixed_plain_html_smiley_embedded.eml',
+        'mixed_plain_html_smiley_embedded.html',
+    ),
+    ('plain_native_utf8.eml', 'plain_native_utf8.html'),
+]
+
+
+class ParsedEmls(dict):
+    """Test data emls by file name, each parsed on first use."""
+
+    def __init__(self, headersonly: bool = False):
+        super().__init__()
+        self.headersonly = headersonly
+
+    def __missing__(self, name: str) -> email.message.Message:
+        # Parse from a file object like process_eml() does. Unlike
+        # message_from_bytes(), that turns CRLF line endings into LF.
+        with open(eml_path / name, 'rb') as f:
+            msg = PARSER.parse(f, headersonly=self.headersonly)
+        self[name] = msg
+        return msg
+
+
+@pytest.fixture(scope='module')
+def parsed_emls():
+    """Return the fully parsed emls, shared by the tests in this module."""
+    return ParsedEmls()
+
+
+@pytest.fixture(scope='module')
+def parsed_headers():
+    """Return the emls parsed up to the end of their headers.
+
+    The body is kept as an unparsed string, so MIME parts and their
+    base64 payloads are skipped.
+    """
+    return ParsedEmls(headersonly=True)
+
+
+@pytest.mark.parametrize(('name', 'src_attr', 'eml_attr'), HEADER_CASES)
+def test_headers(name, src_attr, eml_attr, parsed_headers):
+    """Headers should remain the same from src data and eml files."""
+    src_head = ESCAPED[name][src_attr]
+    eml_head = libeml2pdf.header_to_html(parsed_headers[name].get(eml_attr))
+    assert src_head == eml_head
+
+
+@pytest.mark.parametrize(
+    ('eml', 'html'), PLAIN_TEXT_EMLS, ids=[e for e, _ in PLAIN_TEXT_EMLS]
+)
+def test_plain_text(eml, html, parsed_emls):
+    """Plain text file body should render as html."""
+    eml_html = libeml2pdf._walk_eml(parsed_emls[eml])[0]
+    assert_same_html(eml_html, get_tgt_html(Path(html)).strip())
+
+
+def test_attachments(parsed_emls):
+    """Check if attachments are complete with right name, size and hash."""
+    ats_from_eml = libeml2pdf._walk_eml(parsed_emls['attachments.eml'])[1]
+    for at in ats_from_eml:
+        f_data = (eml_path / Path(at.name)).read_bytes()
+        assert (at.md5sum, at.size) == (
+            hashlib.md5(f_data).hexdigest(),
+            len(f_data),
+        ), at.name
+
+
+def test_inline_doc_is_captured_as_attachment(parsed_emls):
+    """Verify that a .doc file with 'Content-Disposition: inline'
+    is correctly identified as an attachment.
+    """
+    eml_msg = parsed_emls['email_with_doc_attachment.eml']
+    attachments_from_eml = libeml2pdf._walk_eml(eml_msg)[1]
+    # Check if the .doc was found in the attachments list
+    assert len(attachments_from_eml) == 1, (
+        f'Should have found 1 attachment {attachments_from_eml}'
+    )
+
+
+def test_plain_and_html_inline(parsed_emls):
+    """Emls with both plain text and html inline parts render once."""
+    eml_msg = parsed_emls['plain_and_html_inline.eml']
+    eml_html = libeml2pdf._walk_eml(eml_msg)[0]
+    expected = get_tgt_html(Path('plain_and_html_inline.html'))
+    assert_same_html(eml_html.strip(), expected.strip())
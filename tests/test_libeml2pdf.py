@@ -3,8 +3,10 @@
 import logging
 import shutil
 import tempfile
+import time
 import unittest
 from datetime import datetime
+from email.header import Header
 from email.message import EmailMessage
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
@@ -89,6 +91,52 @@ class TestProcessAllEmlsInDir(unittest.TestCase):
         for pdf_file in pdf_files:
             self.assertGreater(pdf_file.stat().st_size, 0)
 
+    @patch('eml2pdf.libeml2pdf.Pool')
+    @patch('eml2pdf.libeml2pdf.process_eml')
+    def test_single_file_skips_pool(self, mock_process, mock_pool):
+        """Test no worker pool is started for a single EML file."""
+        input_dir = self.test_dir / 'single'
+        input_dir.mkdir()
+        (input_dir / 'one.eml').write_bytes(b'Subject: one\n\nbody')
+
+        libeml2pdf.process_all_emls_in_dir(
+            input_dir, self.output_dir, number_of_procs=4
+        )
+
+        mock_pool.assert_not_called()
+        mock_process.assert_called_once()
+
+    def test_bad_eml_does_not_stop_pool(self):
+        """Test the other files are converted when one eml fails."""
+        input_dir = self.test_dir / 'mixed'
+        input_dir.mkdir()
+        for i in range(6):
+            (input_dir / f'good{i}.eml').write_bytes(
+                f'Subject: good {i}\nDate: Mon, 1 Jan 2024 10:00:00 +0000'
+                '\n\nbody'.encode()
+            )
+        # parsedate_to_datetime() raises ValueError for this date.
+        (input_dir / 'bad.eml').write_bytes(
+            b'Subject: bad\nDate: not a date\n\nbody'
+        )
+
+        # Slow renders keep good files pending when the bad one fails.
+        render_pdf = libeml2pdf._render_pdf
+
+        def slow_render_pdf(**kwargs):
+            time.sleep(0.1)
+            render_pdf(**kwargs)
+
+        with (
+            patch.object(libeml2pdf, '_render_pdf', slow_render_pdf),
+            self.assertRaises(ValueError),
+        ):
+            libeml2pdf.process_all_emls_in_dir(
+                input_dir, self.output_dir, number_of_procs=2
+            )
+
+        self.assertEqual(len(list(self.output_dir.glob('*.pdf'))), 6)
+
 
 class TestSetLogLevels(unittest.TestCase):
     """Test the _set_log_levels function."""
@@ -179,6 +227,18 @@ class TestHeaderToHtml(unittest.TestCase):
         result = libeml2pdf.header_to_html('"Test Header"')
         self.assertEqual(result, '&quot;Test Header&quot;')
 
+    def test_unencoded_header_skips_decoding(self):
+        """Headers without encoded words should not be decoded."""
+        with patch('email.header.decode_header') as mock_decode:
+            result = libeml2pdf.header_to_html('Café <cafe@example.com>')
+        mock_decode.assert_not_called()
+        self.assertEqual(result, 'Café &lt;cafe@example.com&gt;')
+
+    def test_header_object(self):
+        """Unhashable email.header.Header objects should be decoded."""
+        header = Header('Café', 'utf-8')
+        self.assertEqual(libeml2pdf.header_to_html(header), 'Café')
+
 
 class TestDecodeToStr(unittest.TestCase):
     """Test _decode_to_str function."""
@@ -198,6 +258,11 @@ class TestDecodeToStr(unittest.TestCase):
         result = libeml2pdf._decode_to_str(b'\xff\xfe', 'utf-8', '7bit')
         self.assertIn('�', result)
 
+    def test_unknown_charset_fallback(self):
+        """Unknown charsets should fall back to UTF-8 in replace mode."""
+        result = libeml2pdf._decode_to_str(b'caf\xc3\xa9', 'x-bogus', '7bit')
+        self.assertEqual(result, 'café')
+
     def test_unicode_escape_handling(self):
         """Unicode escape sequences in decoded bytes."""
         # The function handles unicode escapes in decoded strings
@@ -264,6 +329,62 @@ class TestEmbedImgs(unittest.TestCase):
         self.assertNotIn('cid:img1', result)
         self.assertNotIn('cid:img2', result)
 
+    def test_embed_cid_that_prefixes_another(self):
+        """A CID that is a prefix of another CID must not shadow it."""
+        html = '<img src="cid:img1"><img src="cid:img10">'
+        attachments = {
+            'img1': {
+                'filename': 'img1.png',
+                'content': b'data1',
+                'content_type': 'image/png',
+            },
+            'img10': {
+                'filename': 'img10.gif',
+                'content': b'data10',
+                'content_type': 'image/gif',
+            },
+        }
+        result = libeml2pdf._embed_imgs(html, attachments)
+        self.assertEqual(
+            result,
+            '<img src="data:image/png;base64,ZGF0YTE=">'
+            '<img src="data:image/gif;base64,ZGF0YTEw">',
+        )
+
+    def test_embed_unknown_cid_is_kept(self):
+        """CID references without a matching attachment stay unchanged."""
+        html = '<img src="cid:missing"><img src="cid:image1">'
+        attachments = {
+            'image1': {
+                'filename': 'image.png',
+                'content': b'data1',
+                'content_type': 'image/png',
+            }
+        }
+        result = libeml2pdf._embed_imgs(html, attachments)
+        self.assertEqual(
+            result,
+            '<img src="cid:missing">'
+            '<img src="data:image/png;base64,ZGF0YTE=">',
+        )
+
+    def test_embed_entity_quoted_cid(self):
+        """CID references quoted with &quot; in a style are embedded."""
+        html = '<div style="background:url(&quot;cid:img@x&quot;)"></div>'
+        attachments = {
+            'img@x': {
+                'filename': 'image.png',
+                'content': b'data1',
+                'content_type': 'image/png',
+            }
+        }
+        result = libeml2pdf._embed_imgs(html, attachments)
+        self.assertEqual(
+            result,
+            '<div style="background:url('
+            '&quot;data:image/png;base64,ZGF0YTE=&quot;)"></div>',
+        )
+
     def test_embed_with_empty_html(self):
         """Empty HTML should return empty string."""
         result = libeml2pdf._embed_imgs('', {})
@@ -406,6 +527,15 @@ class TestGetExclusiveOutfile(unittest.TestCase):
         self.assertIn('_3.pdf', outfile.name)
         outfile.close()
 
+    def test_other_errors_are_raised(self):
+        """Errors other than an existing file should not be retried."""
+        output_path = self.test_dir / 'test.pdf'
+        with (
+            patch('builtins.open', side_effect=PermissionError),
+            self.assertRaises(PermissionError),
+        ):
+            libeml2pdf._get_exclusive_outfile(output_path)
+
     def test_creates_file(self):
         """File should be created and writable."""
         output_path = self.test_dir / 'writable.pdf'
@@ -416,6 +546,43 @@ class TestGetExclusiveOutfile(unittest.TestCase):
         self.assertEqual(output_path.read_bytes(), b'test content')
 
 
+class TestGetFilepaths(unittest.TestCase):
+    """Test _get_filepaths function."""
+
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_matches_eml_case_insensitive(self):
+        """Only .eml files, in any case, should be returned."""
+        for name in ('a.eml', 'b.EML', 'c.txt', 'eml'):
+            (self.test_dir / name).touch()
+
+        result = libeml2pdf._get_filepaths(self.test_dir)
+        self.assertEqual(sorted(p.name for p in result), ['a.eml', 'b.EML'])
+
+    def test_does_not_recurse(self):
+        """Directories and files in subdirectories should be skipped."""
+        sub = self.test_dir / 'sub.eml'
+        sub.mkdir()
+        (sub / 'nested.eml').touch()
+
+        self.assertEqual(libeml2pdf._get_filepaths(self.test_dir), [])
+
+    def test_missing_dir(self):
+        """A directory that does not exist should give no files."""
+        missing = self.test_dir / 'missing'
+        self.assertEqual(libeml2pdf._get_filepaths(missing), [])
+
+    def test_file_instead_of_dir(self):
+        """A regular file passed as directory should give no files."""
+        eml = self.test_dir / 'some.eml'
+        eml.touch()
+        self.assertEqual(libeml2pdf._get_filepaths(eml), [])
+
+
 class TestEmailAndHeaderClasses(unittest.TestCase):
     """Test internal class initialization."""
 
@@ -458,11 +625,31 @@ class TestCreateAttachment(unittest.TestCase):
         result = libeml2pdf._create_attachment('test.txt', b'content')
         self.assertIsNotNone(result)
         self.assertEqual(result.name, 'test.txt')
-        self.assertGreater(result.size, 0)
+        self.assertEqual(result.size, len(b'content'))
         self.assertIsNotNone(result.md5sum)
         # TODO how about assertEquals on b'content' md5sum?
 
 
+class TestFmtSize(unittest.TestCase):
+    """Test _fmt_size function."""
+
+    def test_sizes(self):
+        """Sizes should be rounded down to whole binary units."""
+        cases = {
+            0: '0B',
+            1023: '1023B',
+            1024: '1K',
+            2047: '1K',
+            1024**2: '1M',
+            3 * 1024**3 + 1: '3G',
+            1024**4: '1T',
+            2048 * 1024**5: '2048P',
+        }
+        for num_bytes, expected in cases.items():
+            with self.subTest(num_bytes=num_bytes):
+                self.assertEqual(libeml2pdf._fmt_size(num_bytes), expected)
+
+
 class TestGenerateAttachmentList(unittest.TestCase):
     """Test _generate_attachment_list function."""
 
@@ -497,9 +684,9 @@ class TestProcessEmlErrorHandling(unittest.TestCase):
     def tearDown(self):
         shutil.rmtree(self.test_dir, ignore_errors=True)
 
-    def test_unicode_decode_error_fallback(self):
-        """Test UnicodeDecodeError triggers UTF-8 fallback."""
-        eml_content = b'Content-Type: text/plain\n\nHello World'
+    def test_non_utf8_bytes_are_parsed(self):
+        """Test undeclared non-UTF-8 bytes do not break parsing."""
+        eml_content = b'Content-Type: text/plain\n\nH\xe9llo World'
         eml_path = self.test_dir / 'test.eml'
         eml_path.write_bytes(eml_content)
 
@@ -569,3 +756,32 @@ class TestGeneratePdfAdvanced(unittest.TestCase):
         html_path = self.test_dir / 'test.pdf.html'
         self.assertTrue(html_path.exists())
         self.assertIn('<html>', html_path.read_text())
+
+    def test_page_css_is_reused(self):
+        """Test the page stylesheet is parsed once per page size."""
+        self.assertIs(libeml2pdf._page_css('a4'), libeml2pdf._page_css('a4'))
+        self.assertIsNot(
+            libeml2pdf._page_css('a4'), libeml2pdf._page_css('letter')
+        )
+
+    def test_generate_pdf_presentational_hints(self):
+        """Test presentational_hints is passed on to WeasyPrint."""
+        for hints in (True, False):
+            with (
+                self.subTest(hints=hints),
+                patch('eml2pdf.libeml2pdf.HTML') as mock_html,
+            ):
+                libeml2pdf.generate_pdf(
+                    html_content='<p>Test</p>', presentational_hints=hints
+                )
+                kwargs = mock_html.return_value.write_pdf.call_args.kwargs
+                self.assertIs(kwargs['presentational_hints'], hints)
+
+    def test_generate_pdf_url_fetcher(self):
+        """Test only unsafe rendering uses WeasyPrint's default fetcher."""
+        with patch('eml2pdf.libeml2pdf.HTML') as mock_html:
+            libeml2pdf.generate_pdf(html_content='<p>Test</p>')
+            self.assertIn('url_fetcher', mock_html.call_args.kwargs)
+
+            libeml2pdf.generate_pdf(html_content='<p>Test</p>', unsafe=True)
+            self.assertNotIn('url_fetcher', mock_html.call_args.kwargs)
